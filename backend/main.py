@@ -1466,6 +1466,23 @@ async def kill_order(order_id: str):
                 return {"ok": True, "id": order_id}
         return {"error": "not found"}
 
+# Background eth_subscribe watchers feeding the adapters' find_incoming_* (kept referenced so they aren't GC'd)
+_incoming_watchers = []
+
+async def _start_incoming_watcher(get_adapter, ws_env: str):
+    """Start an adapter's incoming-transfer watcher if its WS endpoint is configured."""
+    if not os.getenv(ws_env):
+        return
+    try:
+        adapter = await asyncio.to_thread(get_adapter)
+    except Exception as e:
+        logger.warning(f"{ws_env}: adapter init failed, incoming transfers will be polled: {e}")
+        return
+    if adapter is not None:
+        _incoming_watchers.append(asyncio.create_task(adapter.watch_incoming()))
+
 @app.on_event("startup")
 async def startup():
     asyncio.create_task(poll_orders())
+    await _start_incoming_watcher(_get_opinion_adapter, "BSC_WS_URL")
+    await _start_incoming_watcher(_get_poly_adapter, "POLYGON_WS_URL")
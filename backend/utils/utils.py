@@ -1,36 +1,132 @@
-def build_pooled(books: list[dict], side_key: str) -> list[dict]:
-    """Merge liquidity from multiple orderbooks into a single pooled book."""
-    grid = {}
-    for i in range(1, 1000):
-        grid[i] = 0.0
+import copy
+import heapq
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
-    for book in books:
-        if "error" in book:
-            continue
-        for level in book.get(side_key, []):
-            price_key = round(level["price_cents"] * 10)
-            if price_key in grid:
-                grid[price_key] += level["size"]
+import numpy as np
+from numba import njit
 
+
+def _pooled_levels(keys, amounts) -> list[dict]:
+    """Format (tenth-of-cent key, size) pairs in ascending key order as pooled levels."""
+    # Per-level rounding stays in Python so half-cent totals match round()
+    # exactly (np.round differs at .xx5)
     result = []
     cumsum = 0
-    for key in sorted(grid.keys()):
-        if grid[key] > 0:
-            price = key / 10
-            price_dec = price / 100
-            size = round(grid[key], 2)
-            total = round(price_dec * size, 2)
-            cumsum += total
-            result.append({
-                "price": round(price_dec, 4),
-                "size": size,
-                "total": total,
-                "price_cents": round(price, 1),
-                "cumsum": round(cumsum, 2),
-            })
+    for key, amount in zip(keys, amounts):
+        if amount <= 0:
+            continue
+        price_cents = key / 10
+        size = round(amount, 2)
+        total = round(price_cents / 100 * size, 2)
+        cumsum += total
+        # Integer keys: key / 10 and key / 1000 already equal their round(.., 1) / round(.., 4)
+        result.append({
+            "price": key / 1000,
+            "size": size,
+            "total": total,
+            "price_cents": price_cents,
+            "cumsum": round(cumsum, 2),
+        })
     return result
 
 
+def build_pooled(books: list[dict], side_key: str) -> list[dict]:
+    """Merge liquidity from multiple orderbooks into a single pooled book."""
+    valid = [book for book in books if "error" not in book]
+    if not valid:
+        return []
+
+    # Single venue: nothing to merge if its ticks are already distinct and ordered
+    if len(valid) == 1:
+        levels = valid[0].get(side_key, [])
+        keys = [round(level["price_cents"] * 10) for level in levels]
+        if keys and keys[0] > keys[-1]:
+            levels, keys = levels[::-1], keys[::-1]
+        if all(a < b for a, b in zip(keys, keys[1:])) and all(1 <= k <= 999 for k in keys[:1] + keys[-1:]):
+            return _pooled_levels(keys, [float(level["size"]) for level in levels])
+
+    # Orderbooks arrive price-sorted (asks ascending, bids descending), so merge
+    # the per-book streams instead of hashing into a grid; stable sort covers
+    # anything else without changing the per-tick summation order
+    streams = []
+    for book in valid:
+        keyed = [(round(level["price_cents"] * 10), level["size"]) for level in book.get(side_key, [])]
+        if any(a[0] > b[0] for a, b in zip(keyed, keyed[1:])):
+            keyed.sort(key=itemgetter(0))
+        streams.append(keyed)
+
+    keys = []
+    amounts = []
+    for key, group in groupby(heapq.merge(*streams, key=itemgetter(0)), key=itemgetter(0)):
+        if not 1 <= key <= 999:
+            continue
+        amount = 0.0
+        for _, size in group:
+            amount += size
+        keys.append(key)
+        amounts.append(amount)
+    return _pooled_levels(keys, amounts)
+
+
+@njit(cache=True)
+def _walk_order(bounds, vols, pids, fillable, n_platforms):
+    """Greedy level order ignoring budget, over price-sorted levels.
+
+    Per price group (bounds[g]..bounds[g+1]): levels of already-used platforms
+    first, then the single new platform with most volume (first one on ties).
+    Returns positions into the sorted arrays; unfillable levels are skipped.
+    """
+    out = np.empty(len(pids), dtype=np.int64)
+    used = np.zeros(n_platforms, dtype=np.bool_)
+    vol = np.zeros(n_platforms, dtype=np.float64)
+    seen = np.zeros(n_platforms, dtype=np.bool_)
+    new = np.empty(n_platforms, dtype=np.int64)
+    # Single-pass partition: used-platform levels go straight to out, the rest
+    # are parked here so the best-new pick only rescans new-platform levels
+    rest = np.empty(len(pids), dtype=np.int64)
+    m = 0
+    for g in range(len(bounds) - 1):
+        g0, g1 = bounds[g], bounds[g + 1]
+        n_new = 0
+        n_rest = 0
+        for j in range(g0, g1):
+            p = pids[j]
+            if used[p]:
+                if fillable[j]:
+                    out[m] = j
+                    m += 1
+            else:
+                if fillable[j]:
+                    rest[n_rest] = j
+                    n_rest += 1
+                if not seen[p]:
+                    seen[p] = True
+                    vol[p] = 0.0
+                    new[n_new] = p
+                    n_new += 1
+                vol[p] += vols[j]
+        if n_new == 0:
+            continue
+        best = new[0]
+        for t in range(n_new):
+            seen[new[t]] = False
+            if vol[new[t]] > vol[best]:
+                best = new[t]
+        for t in range(n_rest):
+            j = rest[t]
+            if pids[j] == best:
+                out[m] = j
+                m += 1
+                used[best] = True
+    return out[:m]
+
+
+# Compile on import so the first route request doesn't pay for it
+_walk_order(np.array([0, 1], dtype=np.int64), np.ones(1), np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.bool_), 1)
+
+
 def find_optimal_route(
     full_books: list[dict],
     budget: float,
@@ -43,7 +139,8 @@ def find_optimal_route(
     2. Sort by price (ascending for buy/asks, descending for sell/bids).
     3. Walk through levels greedily — at same price prefer already-used sources
        to minimize total number of platforms used.
-    4. Consume liquidity until budget is exhausted.
+    4. Consume liquidity until budget is exhausted (running remainder +
+       searchsorted over the walk order).
 
     Args:
         full_books: list of dicts with keys {platform, asks, bids}.
@@ -56,111 +153,129 @@ def find_optimal_route(
     if budget <= 0:
         return {"error": "Budget must be > 0"}
 
-    # Collect tagged levels
+    # Hashable snapshot of everything the route depends on; identical polls hit the cache
     side_key = "asks" if direction == "buy" else "bids"
-    levels = []
+    books_key = tuple(
+        (
+            book["platform"],
+            book.get("market_id"),
+            book.get("token_id"),
+            tuple((lv["price"], lv["size"], lv["price_cents"]) for lv in book.get(side_key, [])),
+        )
+        for book in full_books
+    )
+    # Deep copy so no caller can mutate the cached route; float() so 8 and 8.0 share one entry and one result type
+    return copy.deepcopy(_solve(books_key, float(budget), direction))
+
+
+@lru_cache(maxsize=128)
+def _solve(books_key: tuple, budget: float, direction: str) -> dict:
+    """find_optimal_route over a (platform, market_id, token_id, levels) snapshot."""
+    # Collect levels as parallel arrays, tagged with source
+    platforms, prices, sizes, cents = [], [], [], []
+    pids = {}  # platform -> integer id, in first-seen order
+    level_pids = []
     # Map platform -> token_id, market_id
     platform_ids = {}
-    for book in full_books:
-        platform = book["platform"]
+    for platform, market_id, token_id, levels in books_key:
         ids = {}
-        if "market_id" in book and book["market_id"] is not None:
-            ids["market_id"] = book["market_id"]
-        if "token_id" in book and book["token_id"] is not None:
-            ids["token_id"] = book["token_id"]
+        if market_id is not None:
+            ids["market_id"] = market_id
+        if token_id is not None:
+            ids["token_id"] = token_id
         if ids:
             platform_ids[platform] = ids
-        for lv in book.get(side_key, []):
-            levels.append({
-                "platform": platform,
-                "price": lv["price"],
-                "size": lv["size"],
-                "price_cents": lv["price_cents"],
-            })
-
-    if not levels:
+        for price, size, price_cents in levels:
+            platforms.append(platform)
+            level_pids.append(pids.setdefault(platform, len(pids)))
+            prices.append(price)
+            sizes.append(size)
+            cents.append(price_cents)
+
+    if not prices:
         return {"error": "No liquidity available"}
 
-    # Sort: buy -> cheapest first, sell -> most expensive first
-    reverse = direction == "sell"
-    # At same price, prefer sources already used -> handled during walk
-    levels.sort(key=lambda x: x["price"], reverse=reverse)
-
-    # Group levels by price (preserve order)
-    from itertools import groupby
-    grouped = []
-    for price, grp in groupby(levels, key=lambda x: x["price"]):
-        grouped.append((price, list(grp)))
-
-    remaining = budget
-    used_platforms = set()
-    fills = []  # individual fills
-    per_platform = {}  # platform -> {spent, qty}
-
-    def consume(lv):
-        nonlocal remaining
-        if remaining <= 0:
-            return
-        p = lv["platform"]
-        available_cost = lv["price"] * lv["size"]
-        if direction == "buy":
-            spend = min(remaining, available_cost)
-            qty = spend / lv["price"] if lv["price"] > 0 else 0
-        else:
-            qty = min(remaining, lv["size"])
-            spend = qty * lv["price"]
-        if qty <= 0:
-            return
-        fills.append({
-            "platform": p,
-            "price": lv["price"],
-            "price_cents": lv["price_cents"],
-            "size": round(qty, 4),
-            "cost": round(spend, 4),
-        })
-        if p not in per_platform:
-            per_platform[p] = {"spent": 0.0, "qty": 0.0}
-        per_platform[p]["spent"] += spend
-        per_platform[p]["qty"] += qty
-        used_platforms.add(p)
-        remaining -= spend if direction == "buy" else qty
-
-    for price, group in grouped:
-        if remaining <= 0:
-            break
-
-        # 1) Consume from already-used platforms first
-        known = [lv for lv in group if lv["platform"] in used_platforms]
-        for lv in known:
-            consume(lv)
-
-        # 2) If still remaining, pick the single new platform with most liquidity
-        if remaining > 0:
-            new = [lv for lv in group if lv["platform"] not in used_platforms]
-            if new:
-                # Aggregate volume per new platform at this price
-                vol = {}
-                for lv in new:
-                    vol.setdefault(lv["platform"], 0)
-                    vol[lv["platform"]] += lv["price"] * lv["size"]
-                best_new = max(vol, key=vol.get)
-                for lv in new:
-                    if lv["platform"] == best_new:
-                        consume(lv)
-
-    total_spent = sum(v["spent"] for v in per_platform.values())
-    total_qty = sum(v["qty"] for v in per_platform.values())
+    price_arr = np.asarray(prices, dtype=np.float64)
+    size_arr = np.asarray(sizes, dtype=np.float64)
+    cost_arr = price_arr * size_arr
+
+    # Sort: buy -> cheapest first, sell -> most expensive first; lexsort is
+    # stable, so same-price levels keep book order for the walk's tiebreak
+    sort_key = price_arr if direction == "buy" else -price_arr
+    order = np.lexsort((sort_key,))
+    _, starts = np.unique(sort_key[order], return_index=True)
+    bounds = np.append(starts, len(order))
+
+    # Levels that actually fill something when reached with budget left
+    if direction == "buy":
+        fillable = (price_arr > 0) & (cost_arr > 0)
+    else:
+        fillable = size_arr > 0
+
+    pid_arr = np.asarray(level_pids, dtype=np.int64)
+    walk = order[_walk_order(bounds, cost_arr[order], pid_arr[order], fillable[order], len(pids))]
+
+    # Budget cutoff: levels before k are taken whole, level k takes what is left.
+    # rem[j] is the budget left before level j, subtracted in walk order so it
+    # matches a level-by-level walk bit for bit (a prefix sum would not)
+    amounts = cost_arr[walk] if direction == "buy" else size_arr[walk]
+    rem = np.subtract.accumulate(np.r_[float(budget), amounts])
+    k = int(np.searchsorted(-rem[1:], 0.0, side="left"))
+    if k < len(walk):
+        walk = walk[:k + 1]
+        amounts = amounts[:k + 1].copy()
+        amounts[k] = rem[k]
+        remaining = 0.0
+    else:
+        remaining = float(rem[-1])
+
+    # Per-fill columns (SoA) and per-platform totals indexed by platform id
+    fill_pids = pid_arr[walk]
+    if direction == "buy":
+        fill_spend = amounts
+        fill_qty = amounts / price_arr[walk]
+    else:
+        fill_qty = amounts
+        fill_spend = amounts * price_arr[walk]
+    n_platforms = len(pids)
+    spent = np.bincount(fill_pids, weights=fill_spend, minlength=n_platforms)
+    qty = np.bincount(fill_pids, weights=fill_qty, minlength=n_platforms)
+    pp_avg = np.divide(spent, qty, out=np.zeros(n_platforms), where=qty > 0)
+
+    fills = [
+        {
+            "platform": platforms[i],
+            "price": prices[i],
+            "price_cents": cents[i],
+            "size": size,
+            "cost": cost,
+        }
+        for i, size, cost in zip(
+            walk.tolist(),
+            [round(q, 4) for q in fill_qty.tolist()],
+            [round(c, 4) for c in fill_spend.tolist()],
+        )
+    ]
+
+    # Platforms in order of first consumption
+    _, first = np.unique(fill_pids, return_index=True)
+    used = fill_pids[np.sort(first)]
+    names = list(pids)
+
+    total_spent = float(spent[used].sum())
+    total_qty = float(qty[used].sum())
     avg_price = total_spent / total_qty if total_qty > 0 else 0
 
     # Round and add per-platform avg price + ids
-    for p in per_platform:
-        s = per_platform[p]["spent"]
-        q = per_platform[p]["qty"]
-        pp_avg = s / q if q > 0 else 0
-        per_platform[p]["spent"] = round(s, 4)
-        per_platform[p]["qty"] = round(q, 4)
-        per_platform[p]["avg_price"] = round(pp_avg, 6)
-        per_platform[p]["avg_price_cents"] = round(pp_avg * 100, 2)
+    per_platform = {}
+    for pid, s, q, a in zip(used.tolist(), spent[used].tolist(), qty[used].tolist(), pp_avg[used].tolist()):
+        p = names[pid]
+        per_platform[p] = {
+            "spent": round(s, 4),
+            "qty": round(q, 4),
+            "avg_price": round(a, 6),
+            "avg_price_cents": round(a * 100, 2),
+        }
         if p in platform_ids:
             per_platform[p].update(platform_ids[p])
 
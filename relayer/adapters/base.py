@@ -1,6 +1,135 @@
 """Base Adapter - unified interface for all trading platforms"""
+import asyncio
+import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, List, Tuple, Optional
+
+from eth_abi import encode, decode
+from web3 import AsyncWeb3, WebSocketProvider
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on every EVM chain we use
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+
+# 4-byte selectors for common ERC20 / ERC1155 view calls
+SEL_ALLOWANCE = bytes.fromhex("dd62ed3e")  # allowance(address,address)
+SEL_BALANCE_OF = bytes.fromhex("70a08231")  # balanceOf(address)
+SEL_BALANCE_OF_1155 = bytes.fromhex("00fdd58e")  # balanceOf(address,uint256)
+SEL_IS_APPROVED_FOR_ALL = bytes.fromhex("e985e9c5")  # isApprovedForAll(address,address)
+
+
+class OrderTimeout(Exception):
+    """Order submission exceeded its latency budget; treat as no-fill (the venue may still accept it late)."""
+
+
+def multicall3(w3, calls: List[Tuple[str, bytes]]) -> List[Tuple[bool, bytes]]:
+    """
+    Run several view calls in a single eth_call via Multicall3.aggregate3
+
+    Args:
+        w3: Web3 instance for the target chain
+        calls: list of (target address, calldata)
+
+    Returns:
+        list of (success, returnData) in call order
+    """
+    data = AGGREGATE3_SELECTOR + encode(
+        ["(address,bool,bytes)[]"], [[(target, True, calldata) for target, calldata in calls]]
+    )
+    raw = w3.eth.call({"to": MULTICALL3_ADDRESS, "data": data})
+    return decode(["(bool,bytes)[]"], raw)[0]
+
+
+def as_bytes(v) -> bytes:
+    """Log field as plain bytes whether the provider returned HexBytes/bytearray or a 0x-hex string."""
+    return bytes(v) if isinstance(v, (bytes, bytearray)) else bytes.fromhex(v.removeprefix("0x"))
+
+
+class TransferWatcher:
+    """
+    Incoming ERC20 / ERC1155 transfers pushed via eth_subscribe, so find_incoming_* can skip get_logs
+
+    Entries are (token_id or None, amount, tx_hash, block, monotonic ts).
+    """
+
+    NOT_FOUND = {"found": False, "tx_hash": None, "amount": 0, "block": 0}
+
+    def __init__(self, block_time: float, maxlen: int = 512):
+        self.block_time = block_time
+        self.incoming = deque(maxlen=maxlen)
+        self.live = False
+        self.live_since = 0.0  # monotonic time the current subscription went live
+
+    async def run(self, ws_url: Optional[str], env_var: str, filters: Dict[str, dict], label: str):
+        """
+        Subscribe and record transfers until cancelled. Opt-in: run as a background task.
+        Reconnects on drop; callers poll while it is down.
+
+        Args:
+            ws_url: WebSocket RPC URL, falls back to the env_var environment variable
+            filters: {"erc20" | "erc1155": eth_subscribe logs filter}
+            label: platform name for log lines
+        """
+        ws_url = ws_url or os.getenv(env_var)
+        if not ws_url:
+            logger.warning(f"{env_var} not set, incoming transfers will be polled")
+            return
+        while True:
+            try:
+                async with AsyncWeb3(WebSocketProvider(ws_url)) as ws:
+                    kinds = {}
+                    for kind, f in filters.items():
+                        kinds[await ws.eth.subscribe("logs", f)] = kind
+                    self.live_since = time.monotonic()
+                    self.live = True
+                    logger.info(f"{label} incoming-transfer watcher subscribed")
+                    async for msg in ws.socket.process_subscriptions():
+                        log = msg["result"]
+                        if log.get("removed"):
+                            continue
+                        data = as_bytes(log["data"])
+                        if kinds.get(msg["subscription"]) == "erc1155":
+                            entry = (int.from_bytes(data[0:32], "big"), int.from_bytes(data[32:64], "big"))
+                        else:
+                            entry = (None, int.from_bytes(data[0:32], "big"))
+                        tx_hash = "0x" + as_bytes(log["transactionHash"]).hex()
+                        self.incoming.append(entry + (tx_hash, log["blockNumber"], time.monotonic()))
+            except asyncio.CancelledError:
+                self.live = False
+                raise
+            except Exception as e:
+                logger.warning(f"{label} WS watcher dropped: {e}")
+            self.live = False
+            await asyncio.sleep(2)
+
+    def pushed(self, token_id, min_amount, blocks_back: int) -> Optional[dict]:
+        """
+        Newest pushed transfer matching token_id/min_amount within blocks_back
+
+        Returns a find_incoming_* result when the buffer can answer: a hit, or not-found once the
+        subscription has been live for the whole window. None means the caller has to poll.
+        """
+        if not self.live:
+            return None
+        now = time.monotonic()
+        oldest = now - blocks_back * self.block_time
+        # Snapshot: the watcher appends from the event loop while callers run in worker threads
+        entries = tuple(self.incoming)
+        for tid, amount, tx_hash, block, ts in reversed(entries):
+            if ts < oldest:
+                break
+            if tid == token_id and amount >= min_amount:
+                return {"found": True, "tx_hash": tx_hash, "amount": amount, "block": block}
+        # A miss is authoritative only if we were subscribed for the whole window and nothing in it was evicted
+        evicted = len(entries) == self.incoming.maxlen and entries[0][4] > oldest
+        if self.live_since <= oldest and not evicted:
+            return dict(self.NOT_FOUND)
+        return None
 
 
 class BaseAdapter(ABC):
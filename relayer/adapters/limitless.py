@@ -19,6 +19,23 @@ logger = logging.getLogger(__name__)
 
 API_BASE = "https://api.limitless.exchange"
 
+# EIP-712 Order struct, constant for every Limitless exchange contract
+ORDER_TYPES = {
+    "Order": [
+        {"name": "salt", "type": "uint256"},
+        {"name": "maker", "type": "address"},
+        {"name": "signer", "type": "address"},
+        {"name": "taker", "type": "address"},
+        {"name": "tokenId", "type": "uint256"},
+        {"name": "makerAmount", "type": "uint256"},
+        {"name": "takerAmount", "type": "uint256"},
+        {"name": "expiration", "type": "uint256"},
+        {"name": "nonce", "type": "uint256"},
+        {"name": "feeRateBps", "type": "uint256"},
+        {"name": "side", "type": "uint8"},
+        {"name": "signatureType", "type": "uint8"},
+    ]
+}
 
 
 class LimitlessAdapter(BaseAdapter):
@@ -44,6 +61,7 @@ class LimitlessAdapter(BaseAdapter):
         self._owner_id = None
         self._auth_headers = {}
         self.api_key = os.getenv("LIMITLESS_API_KEY", "")
+        self._domains = {}
         logger.info(f"Limitless adapter initialized, EOA={self.account.address}")
 
     # --- Auth ---
@@ -98,34 +116,25 @@ class LimitlessAdapter(BaseAdapter):
     # Exchange contract on Base (from API error response)
     CTF_EXCHANGE = "0x5a38afc17F7E97ad8d6C547ddb837E40B4aEDfC6"
 
+    def _domain(self, exchange_address: str) -> dict:
+        """EIP-712 domain per exchange contract, built once."""
+        domain = self._domains.get(exchange_address)
+        if domain is None:
+            domain = {
+                "name": "Limitless CTF Exchange",
+                "version": "1",
+                "chainId": self.CHAIN_ID,
+                "verifyingContract": exchange_address,
+            }
+            self._domains[exchange_address] = domain
+        return domain
+
     def _sign_order_eip712(self, order_data: dict, exchange_address: str = None) -> str:
         """Sign order using EIP-712 with Limitless exchange contract."""
         from eth_account.messages import encode_typed_data
 
-        contract = exchange_address or self.CTF_EXCHANGE
-        domain = {
-            "name": "Limitless CTF Exchange",
-            "version": "1",
-            "chainId": self.CHAIN_ID,
-            "verifyingContract": contract,
-        }
-        types = {
-            "Order": [
-                {"name": "salt", "type": "uint256"},
-                {"name": "maker", "type": "address"},
-                {"name": "signer", "type": "address"},
-                {"name": "taker", "type": "address"},
-                {"name": "tokenId", "type": "uint256"},
-                {"name": "makerAmount", "type": "uint256"},
-                {"name": "takerAmount", "type": "uint256"},
-                {"name": "expiration", "type": "uint256"},
-                {"name": "nonce", "type": "uint256"},
-                {"name": "feeRateBps", "type": "uint256"},
-                {"name": "side", "type": "uint8"},
-                {"name": "signatureType", "type": "uint8"},
-            ]
-        }
-        encoded = encode_typed_data(domain, types, order_data)
+        domain = self._domain(exchange_address or self.CTF_EXCHANGE)
+        encoded = encode_typed_data(domain, ORDER_TYPES, order_data)
         signed = self.account.sign_message(encoded)
         sig = signed.signature.hex()
         return "0x" + sig if not sig.startswith("0x") else sig
@@ -6,18 +6,75 @@ All transfers done via execTransaction
 
 import os
 import time
+import asyncio
+import threading
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
-from decimal import Decimal
-from web3 import Web3
+from decimal import Decimal, ROUND_DOWN
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+from eth_abi import encode, decode
 from eth_account import Account
 
-from .base import BaseAdapter
+from .base import (
+    BaseAdapter, OrderTimeout, TransferWatcher, as_bytes, multicall3,
+    SEL_ALLOWANCE, SEL_BALANCE_OF, SEL_BALANCE_OF_1155, SEL_IS_APPROVED_FOR_ALL,
+)
 
 logger = logging.getLogger(__name__)
 
+# Opinion SDK names, imported on first use so the adapter module stays cheap to load
+_BUY = _SELL = _LIMIT = _PlaceOrderDataInput = None
+
+
+def _to_wei_18(v) -> int:
+    """Decimal amount (API string) to 18-decimal integer without a float round-trip; truncates extra digits."""
+    s = str(v).strip()
+    if 'e' in s or 'E' in s:
+        s = format(Decimal(s), 'f')
+    int_part, _, frac = s.partition('.')
+    return int(int_part or '0') * 10**18 + int(frac.ljust(18, '0')[:18])
+
+
+def _ensure_sdk():
+    global _BUY, _SELL, _LIMIT, _PlaceOrderDataInput
+    if _PlaceOrderDataInput is None:
+        from opinion_clob_sdk.chain.py_order_utils.model.sides import BUY, SELL
+        from opinion_clob_sdk.chain.py_order_utils.model.order import PlaceOrderDataInput
+        from opinion_clob_sdk.chain.py_order_utils.model.order_type import LIMIT_ORDER
+        _BUY, _SELL, _LIMIT, _PlaceOrderDataInput = BUY, SELL, LIMIT_ORDER, PlaceOrderDataInput
+
+
+MULTISEND_SELECTOR = bytes.fromhex("8d80ff0a")  # multiSend(bytes)
+
+# ABIs parsed once at import; contracts are built per adapter in __init__
+ERC20_ABI = [
+    {"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf",
+     "outputs": [{"type": "uint256"}], "type": "function"},
+    {"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
+     "name": "allowance", "outputs": [{"type": "uint256"}], "type": "function"},
+    {"inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}],
+     "name": "approve", "outputs": [{"type": "bool"}], "type": "function"},
+    {"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
+                {"name": "amount", "type": "uint256"}], "name": "transferFrom",
+     "outputs": [{"type": "bool"}], "type": "function"},
+]
+CTF_ABI = [
+    {"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}],
+     "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "account", "type": "address"}, {"name": "operator", "type": "address"}],
+     "name": "isApprovedForAll", "outputs": [{"type": "bool"}], "type": "function"},
+    {"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}],
+     "name": "setApprovalForAll", "outputs": [], "type": "function"},
+    {"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
+                {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"},
+                {"name": "data", "type": "bytes"}], "name": "safeTransferFrom",
+     "outputs": [], "type": "function"},
+]
+
 
 class OpinionAdapter(BaseAdapter):
     """Opinion Markets adapter with Smart Wallet support"""
@@ -37,11 +94,37 @@ class OpinionAdapter(BaseAdapter):
     MULTISEND = "0x998739BFdAAdde7C933B942a68053933098f9EDa"
     CTF_EXCHANGE = "0x59047B5d5BB568730Eb5462eb1DEeB1fC17126Db"
 
+    # Event topics for incoming-transfer scans
+    TRANSFER_SINGLE_TOPIC = '0x' + Web3.keccak(text="TransferSingle(address,address,address,uint256,uint256)").hex()
+    TRANSFER_TOPIC = '0x' + Web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+    # Safe v1.3 execTransaction pieces, encoded locally instead of via safe-eth-py
+    SAFE_TX_TYPEHASH = Web3.keccak(text="SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,"
+                                        "uint256 baseGas,uint256 gasPrice,address gasToken,address refundReceiver,uint256 nonce)")
+    EXEC_TRANSACTION_SELECTOR = Web3.keccak(
+        text="execTransaction(address,uint256,bytes,uint8,uint256,uint256,uint256,address,address,bytes)")[:4]
+    SAFE_TX_GAS_PRICE = int(0.05 * 10**9)
+
+    # Block window per eth_getLogs call when the node refuses the full blocks_back range in one query
+    LOG_SCAN_WINDOW = 10
+    # Seconds a positive approval/allowance read is trusted before hitting the chain again
+    APPROVAL_CACHE_TTL = 60
+    # BSC gas price barely moves between 3s blocks, so reuse a read for this many seconds
+    GAS_PRICE_TTL = 5
+    # BSC block time, used to age out transfers pushed by the WebSocket watcher
+    BLOCK_TIME = 3
+
     def __init__(self, private_key: str, smart_wallet: str, main_relayer_key: str, rpc_url: str = None):
         if not private_key.startswith('0x'):
             private_key = '0x' + private_key
         self.private_key = private_key
         self.smart_wallet = Web3.to_checksum_address(smart_wallet)
+        self._wallet_topic = '0x' + self.smart_wallet[2:].lower().zfill(64)
+        # Checksum contract constants once; methods use them as-is
+        self.CONDITIONAL_TOKENS = Web3.to_checksum_address(self.CONDITIONAL_TOKENS)
+        self.USDT_ADDRESS = Web3.to_checksum_address(self.USDT_ADDRESS)
+        self.MULTISEND = Web3.to_checksum_address(self.MULTISEND)
+        self.CTF_EXCHANGE = Web3.to_checksum_address(self.CTF_EXCHANGE)
         self.account = Account.from_key(private_key)
         self.eoa_address = self.account.address
 
@@ -51,7 +134,13 @@ class OpinionAdapter(BaseAdapter):
         self._main_relayer_address = self._main_account.address
 
         self.rpc_url = rpc_url or os.getenv('BSC_RPC_URL', 'https://bsc-dataseed.binance.org')
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # One keep-alive connection pool shared by web3 and the raw JSON-RPC batch calls
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url, session=self._session))
+        self.aw3 = AsyncWeb3(AsyncHTTPProvider(self.rpc_url))
+        self._usdt = self.w3.eth.contract(address=self.USDT_ADDRESS, abi=ERC20_ABI)
+        self._ctf = self.w3.eth.contract(address=self.CONDITIONAL_TOKENS, abi=CTF_ABI)
 
         self.api_key = os.getenv('OPINION_API_KEY')
         if not self.api_key:
@@ -59,6 +148,19 @@ class OpinionAdapter(BaseAdapter):
 
         self._client = None
         self._authenticated = False
+        self._order_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="opinion-order")
+        # Safe domain separator is fixed per wallet, so it is read once and cached
+        self._safe_lock = threading.Lock()
+        self._safe_domain = None
+        # Incoming transfers pushed by watch_incoming()
+        self._watcher = TransferWatcher(self.BLOCK_TIME, maxlen=512)
+        # Main-EOA nonce pool so overlapping transfers never reuse a nonce
+        self._nonce_lock = threading.Lock()
+        self._next_nonce = None
+        self._nonce_inflight = 0
+        self._gas_price = (0, float('-inf'))
+        # (owner, operator, token) -> (result, monotonic ts); only granted approvals are cached
+        self._approval_cache = {}
 
         logger.info(f"Opinion adapter initialized, EOA={self.eoa_address}, SW={self.smart_wallet}")
 
@@ -90,29 +192,36 @@ class OpinionAdapter(BaseAdapter):
 
     # --- Order Methods ---
 
-    def place_order(self, token_id: str, market_id: int, amount: float, price: float, side: str) -> Dict[str, Any]:
-        from decimal import Decimal, ROUND_DOWN
-        from opinion_clob_sdk.chain.py_order_utils.model.sides import BUY, SELL
-        from opinion_clob_sdk.chain.py_order_utils.model.order import PlaceOrderDataInput
-        from opinion_clob_sdk.chain.py_order_utils.model.order_type import LIMIT_ORDER
-
-        order_side = BUY if side.upper() == 'BUY' else SELL
+    def place_order(self, token_id: str, market_id: int, amount: float, price: float, side: str,
+                    timeout_ms: int = None) -> Dict[str, Any]:
+        """Place a limit order. With timeout_ms, raise OrderTimeout if the SDK call overruns the budget."""
+        _ensure_sdk()
+        order_side = _BUY if side.upper() == 'BUY' else _SELL
 
         if side.upper() == 'BUY':
-            order_data = PlaceOrderDataInput(
+            order_data = _PlaceOrderDataInput(
                 marketId=market_id, tokenId=token_id, price=str(price),
-                makerAmountInQuoteToken=amount, side=order_side, orderType=LIMIT_ORDER,
+                makerAmountInQuoteToken=amount, side=order_side, orderType=_LIMIT,
             )
             logger.info(f"Opinion BUY: {amount} USDT @ {price}")
         else:
             amount = float(Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_DOWN))
-            order_data = PlaceOrderDataInput(
+            order_data = _PlaceOrderDataInput(
                 marketId=market_id, tokenId=token_id, price=str(price),
-                makerAmountInBaseToken=amount, side=order_side, orderType=LIMIT_ORDER,
+                makerAmountInBaseToken=amount, side=order_side, orderType=_LIMIT,
             )
             logger.info(f"Opinion SELL: {amount} shares @ {price}")
 
-        result = self.client.place_order(order_data)
+        if timeout_ms is None:
+            result = self.client.place_order(order_data)
+        else:
+            future = self._order_pool.submit(self.client.place_order, order_data)
+            try:
+                result = future.result(timeout=timeout_ms / 1000)
+            except FutureTimeout:
+                # The request cannot be aborted mid-flight; the caller treats this as no-fill
+                logger.warning(f"Opinion order timed out after {timeout_ms}ms: {side} {amount} @ {price}")
+                raise OrderTimeout(f"Opinion order exceeded {timeout_ms}ms")
 
         if result.errno != 0:
             raise Exception(f"Opinion order failed: {result.errmsg}")
@@ -128,95 +237,201 @@ class OpinionAdapter(BaseAdapter):
 
     # --- Smart Wallet Execution ---
 
-    def exec_transaction(self, to: str, value: int, data: bytes, operation: int = 0) -> str:
-        from safe_eth.safe import Safe
-        from safe_eth.eth import EthereumClient
-
-        eth_client = EthereumClient(self.rpc_url)
-        safe = Safe(self.smart_wallet, eth_client)
-
-        safe_tx = safe.build_multisig_tx(
-            to=Web3.to_checksum_address(to), value=value, data=data,
-            operation=operation, safe_tx_gas=0, base_gas=0, gas_price=0,
-            gas_token=None, refund_receiver=None,
-        )
-        safe_tx.sign(self.private_key)
-
-        tx_hash, tx = safe_tx.execute(
-            tx_sender_private_key=self.private_key,
-            tx_gas=150000, tx_gas_price=int(0.05 * 10**9),
+    def _safe_call(self, signature: str) -> bytes:
+        return self.w3.eth.call({'to': self.smart_wallet, 'data': Web3.keccak(text=signature)[:4]})
+
+    def exec_transaction(self, to: str, value: int, data: bytes, operation: int = 0, tx_gas: int = 150000) -> str:
+        """Sign a SafeTx with the owner key and submit execTransaction from the owner EOA (1-of-1 Safe)."""
+        to = Web3.to_checksum_address(to)
+        zero = '0x' + '00' * 20
+        with self._safe_lock:
+            if self._safe_domain is None:
+                self._safe_domain = self._safe_call('domainSeparator()')
+        # Read the Safe nonce every time: a dropped or reverted execTransaction does not consume it
+        safe_nonce = decode(['uint256'], self._safe_call('nonce()'))[0]
+
+        struct_hash = Web3.keccak(encode(
+            ['bytes32', 'address', 'uint256', 'bytes32', 'uint8', 'uint256', 'uint256', 'uint256', 'address', 'address', 'uint256'],
+            [self.SAFE_TX_TYPEHASH, to, value, Web3.keccak(data), operation, 0, 0, 0, zero, zero, safe_nonce],
+        ))
+        safe_tx_hash = Web3.keccak(b'\x19\x01' + self._safe_domain + struct_hash)
+        # Signature over the SafeTx hash itself, so v stays 27/28 (Safe only expects +4 for eth_sign)
+        signature = Account.unsafe_sign_hash(safe_tx_hash, self.private_key).signature
+
+        calldata = self.EXEC_TRANSACTION_SELECTOR + encode(
+            ['address', 'uint256', 'bytes', 'uint8', 'uint256', 'uint256', 'uint256', 'address', 'address', 'bytes'],
+            [to, value, data, operation, 0, 0, 0, zero, zero, signature],
         )
+        tx = {
+            'from': self.eoa_address, 'to': self.smart_wallet, 'value': 0, 'data': calldata,
+            'nonce': self.w3.eth.get_transaction_count(self.eoa_address, 'pending'),
+            'gas': tx_gas, 'gasPrice': self.SAFE_TX_GAS_PRICE, 'chainId': self.CHAIN_ID,
+        }
+        signed = self.account.sign_transaction(tx)
+        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
         h = '0x' + tx_hash.hex()
         logger.info(f"Safe TX executed: {h}")
         return h
 
+    @staticmethod
+    def _encode_multisend(calls: list) -> bytes:
+        """
+        Encode MultiSend.multiSend(bytes) calldata
+
+        Args:
+            calls: list of (operation, to, value, data); each is packed as
+                   operation(1) || to(20) || value(32) || len(data)(32) || data
+        """
+        packed = b''.join(
+            op.to_bytes(1, 'big') + bytes.fromhex(to[2:]) + value.to_bytes(32, 'big')
+            + len(data).to_bytes(32, 'big') + data
+            for op, to, value, data in calls
+        )
+        return MULTISEND_SELECTOR + encode(['bytes'], [packed])
+
+    def exec_multisend(self, calls: list, tx_gas: int = 250000) -> str:
+        """Execute several (operation, to, value, data) calls as one Safe tx via MultiSend delegatecall."""
+        data = self._encode_multisend(calls)
+        return self.exec_transaction(to=self.MULTISEND, value=0, data=data, operation=1, tx_gas=tx_gas)
+
     # --- Transfer Methods ---
 
+    def _nonce_and_gas_price(self, address: str) -> tuple:
+        """Pending nonce + gas price for address in a single JSON-RPC batch round-trip."""
+        payload = [
+            {"jsonrpc": "2.0", "id": 1, "method": "eth_getTransactionCount", "params": [address, "pending"]},
+            {"jsonrpc": "2.0", "id": 2, "method": "eth_gasPrice", "params": []},
+        ]
+        resp = self._session.post(self.rpc_url, json=payload, timeout=10)
+        resp.raise_for_status()
+        by_id = {r.get('id'): r for r in resp.json()}
+        for r in by_id.values():
+            if 'error' in r:
+                raise Exception(f"RPC batch error: {r['error']}")
+        return Web3.to_int(hexstr=by_id[1]['result']), Web3.to_int(hexstr=by_id[2]['result'])
+
+    def _cached_gas_price(self, fresh: int = None) -> int:
+        """Gas price reused for GAS_PRICE_TTL seconds; `fresh` seeds it from a read done elsewhere."""
+        now = time.monotonic()
+        if fresh is not None:
+            self._gas_price = (fresh, now)
+        elif now - self._gas_price[1] >= self.GAS_PRICE_TTL:
+            self._gas_price = (self.w3.eth.gas_price, now)
+        return self._gas_price[0]
+
+    def _reserve_nonce(self) -> tuple:
+        """Reserve the next main-EOA nonce from the local pool. Returns (nonce, gas_price).
+
+        The main EOA also sends from backend/main.py, so whenever nothing of ours is in flight the
+        pool takes max(local next, chain pending). Every reservation must be closed with _release_nonce().
+        """
+        chain_nonce = gas_price = None
+        while True:
+            with self._nonce_lock:
+                if chain_nonce is not None or (self._nonce_inflight > 0 and self._next_nonce is not None):
+                    nonce = max(n for n in (self._next_nonce, chain_nonce) if n is not None)
+                    self._next_nonce = nonce + 1
+                    self._nonce_inflight += 1
+                    return nonce, self._cached_gas_price(gas_price)
+            # RPC outside the lock; concurrent syncs are reconciled by the max() above
+            chain_nonce, gas_price = self._nonce_and_gas_price(self._main_relayer_address)
+
+    @staticmethod
+    def _is_nonce_error(e: BaseException) -> bool:
+        msg = str(e).lower()
+        return 'nonce' in msg or 'replacement transaction underpriced' in msg or 'already known' in msg
+
+    def _release_nonce(self, nonce: int, exc: BaseException = None):
+        """Close a reservation. A nonce error resyncs the pool from chain; other failures hand the nonce back."""
+        with self._nonce_lock:
+            self._nonce_inflight -= 1
+            if exc is None:
+                return
+            if self._is_nonce_error(exc) or self._next_nonce != nonce + 1:
+                # Clash with another sender, or later nonces were handed out past the gap: take it from chain
+                self._next_nonce = None
+            else:
+                self._next_nonce = nonce
+
+    def _main_tx(self, fn, gas: int) -> dict:
+        """Build a main-EOA tx for a prepared contract call on a pooled nonce."""
+        nonce, gas_price = self._reserve_nonce()
+        try:
+            return fn.build_transaction({
+                'from': self._main_relayer_address, 'gas': gas, 'gasPrice': gas_price,
+                'nonce': nonce, 'chainId': self.CHAIN_ID,
+            })
+        except Exception as e:
+            self._release_nonce(nonce, e)
+            raise
+
+    def _send_from_main(self, tx) -> str:
+        """Sign with main EOA and broadcast a tx from _main_tx()."""
+        try:
+            signed = self._main_account.sign_transaction(tx)
+            h = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            self._release_nonce(tx['nonce'], e)
+            raise
+        self._release_nonce(tx['nonce'])
+        return '0x' + h.hex()
+
+    def _usdt_from_user_tx(self, user_address: str, amount_wei: int) -> dict:
+        user = Web3.to_checksum_address(user_address)
+        return self._main_tx(self._usdt.functions.transferFrom(user, self.smart_wallet, amount_wei), 100000)
+
+    def _erc1155_from_user_tx(self, user_address: str, token_id: str, amount_wei: int) -> dict:
+        user = Web3.to_checksum_address(user_address)
+        fn = self._ctf.functions.safeTransferFrom(user, self.smart_wallet, int(token_id), amount_wei, b'')
+        return self._main_tx(fn, 150000)
+
     def transfer_usdt_from_user(self, user_address: str, amount_wei: int) -> str:
         """Transfer USDT from user to smart wallet. Main EOA pays gas."""
-        user = Web3.to_checksum_address(user_address)
-        main_eoa = self._main_relayer_address
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
-                           {"name": "amount", "type": "uint256"}], "name": "transferFrom",
-                "outputs": [{"type": "bool"}], "type": "function"}]
-        usdt = self.w3.eth.contract(address=self.USDT_ADDRESS, abi=abi)
-        tx = usdt.functions.transferFrom(user, self.smart_wallet, amount_wei).build_transaction({
-            'from': main_eoa, 'gas': 100000, 'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(main_eoa), 'chainId': self.CHAIN_ID,
-        })
-        signed = self._main_account.sign_transaction(tx)
-        h = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        return '0x' + h.hex()
+        return self._send_from_main(self._usdt_from_user_tx(user_address, amount_wei))
 
     def transfer_erc1155_from_user(self, user_address: str, token_id: str, amount_wei: int) -> str:
         """Transfer ERC1155 from user to smart wallet. Main EOA pays gas."""
-        user = Web3.to_checksum_address(user_address)
-        main_eoa = self._main_relayer_address
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
-                           {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"},
-                           {"name": "data", "type": "bytes"}], "name": "safeTransferFrom",
-                "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CONDITIONAL_TOKENS), abi=abi)
-        tx = ctf.functions.safeTransferFrom(user, self.smart_wallet, int(token_id), amount_wei, b'').build_transaction({
-            'from': main_eoa, 'gas': 150000, 'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(main_eoa), 'chainId': self.CHAIN_ID,
-        })
-        signed = self._main_account.sign_transaction(tx)
-        h = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        return self._send_from_main(self._erc1155_from_user_tx(user_address, token_id, amount_wei))
+
+    async def _send_from_main_async(self, tx) -> str:
+        try:
+            signed = self._main_account.sign_transaction(tx)
+            h = await self.aw3.eth.send_raw_transaction(signed.raw_transaction)
+        except BaseException as e:
+            self._release_nonce(tx['nonce'], e)
+            raise
+        self._release_nonce(tx['nonce'])
         return '0x' + h.hex()
 
+    async def transfer_usdt_from_user_async(self, user_address: str, amount_wei: int) -> str:
+        """Async transfer_usdt_from_user; nonce comes from the shared pool."""
+        tx = await asyncio.to_thread(self._usdt_from_user_tx, user_address, amount_wei)
+        return await self._send_from_main_async(tx)
+
+    async def transfer_erc1155_from_user_async(self, user_address: str, token_id: str, amount_wei: int) -> str:
+        """Async transfer_erc1155_from_user; nonce comes from the shared pool."""
+        tx = await asyncio.to_thread(self._erc1155_from_user_tx, user_address, token_id, amount_wei)
+        return await self._send_from_main_async(tx)
+
+    async def settle(self, user_address: str, usdt_amount_wei: int, token_id: str, shares_wei: int) -> Dict[str, str]:
+        """Pull USDT and shares from user with both transfers in flight at once."""
+        usdt_tx, ctf_tx = await asyncio.gather(
+            self.transfer_usdt_from_user_async(user_address, usdt_amount_wei),
+            self.transfer_erc1155_from_user_async(user_address, token_id, shares_wei),
+        )
+        return {'usdt': usdt_tx, 'ctf': ctf_tx}
+
     def transfer_usdt_to_user(self, user_address: str, amount_wei: int) -> str:
         """Transfer USDT from smart wallet to user. Main EOA pays gas (needs transferFrom approval)."""
         to_addr = Web3.to_checksum_address(user_address)
-        main_eoa = self._main_relayer_address
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
-                           {"name": "amount", "type": "uint256"}], "name": "transferFrom",
-                "outputs": [{"type": "bool"}], "type": "function"}]
-        usdt = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDT_ADDRESS), abi=abi)
-        tx = usdt.functions.transferFrom(self.smart_wallet, to_addr, amount_wei).build_transaction({
-            'from': main_eoa, 'gas': 100000, 'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(main_eoa), 'chainId': self.CHAIN_ID,
-        })
-        signed = self._main_account.sign_transaction(tx)
-        h = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        return '0x' + h.hex()
+        fn = self._usdt.functions.transferFrom(self.smart_wallet, to_addr, amount_wei)
+        return self._send_from_main(self._main_tx(fn, 100000))
 
     def transfer_erc1155_to_user(self, user_address: str, token_id: str, amount_wei: int) -> str:
         """Transfer ERC1155 from smart wallet to user. Main EOA pays gas (needs approval)."""
         to_addr = Web3.to_checksum_address(user_address)
-        main_eoa = self._main_relayer_address
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"},
-                           {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"},
-                           {"name": "data", "type": "bytes"}], "name": "safeTransferFrom",
-                "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CONDITIONAL_TOKENS), abi=abi)
-        tx = ctf.functions.safeTransferFrom(self.smart_wallet, to_addr, int(token_id), amount_wei, b'').build_transaction({
-            'from': main_eoa, 'gas': 150000, 'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(main_eoa), 'chainId': self.CHAIN_ID,
-        })
-        signed = self._main_account.sign_transaction(tx)
-        h = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        return '0x' + h.hex()
+        fn = self._ctf.functions.safeTransferFrom(self.smart_wallet, to_addr, int(token_id), amount_wei, b'')
+        return self._send_from_main(self._main_tx(fn, 150000))
 
     # --- Balance Methods ---
 
@@ -226,59 +441,73 @@ class OpinionAdapter(BaseAdapter):
 
     def get_stablecoin_balance(self, address: str = None) -> int:
         addr = Web3.to_checksum_address(address or self.smart_wallet)
-        abi = [{"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf",
-                "outputs": [{"type": "uint256"}], "type": "function"}]
-        usdt = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDT_ADDRESS), abi=abi)
-        return usdt.functions.balanceOf(addr).call()
+        raw = self.w3.eth.call({'to': self._usdt.address, 'data': SEL_BALANCE_OF + encode(['address'], [addr])})
+        return int.from_bytes(raw, 'big')
 
     def get_usdt_balance(self) -> int:
         return self.get_stablecoin_balance()
 
     def get_token_balance(self, address: str, token_id: str) -> int:
         addr = Web3.to_checksum_address(address)
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}],
-                "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CONDITIONAL_TOKENS), abi=abi)
-        return ctf.functions.balanceOf(addr, int(token_id)).call()
+        data = SEL_BALANCE_OF_1155 + encode(['address', 'uint256'], [addr, int(token_id)])
+        return int.from_bytes(self.w3.eth.call({'to': self._ctf.address, 'data': data}), 'big')
 
     def get_shares_balance(self, token_id: str) -> int:
         """ERC1155 balance on smart wallet."""
         return self.get_token_balance(self.smart_wallet, token_id)
 
+    def get_balances_bulk(self, token_ids: list, address: str = None) -> list:
+        """ERC1155 balances for several token_ids in one multicall (smart wallet by default)."""
+        addr = Web3.to_checksum_address(address or self.smart_wallet)
+        calls = [(self._ctf.address, SEL_BALANCE_OF_1155 + encode(['address', 'uint256'], [addr, int(t)])) for t in token_ids]
+        return [int.from_bytes(ret, 'big') if ok else 0 for ok, ret in multicall3(self.w3, calls)]
+
     def get_user_shares_balance(self, token_id: str, user_address: str) -> int:
         return self.get_token_balance(user_address, token_id)
 
     # --- Approval Methods ---
 
+    def _cached_approval(self, key: tuple):
+        hit = self._approval_cache.get(key)
+        if hit and time.monotonic() - hit[1] < self.APPROVAL_CACHE_TTL:
+            return hit[0]
+        return None
+
+    def _store_approval(self, key: tuple, result):
+        # Missing approvals are not cached so a user who approves right after a rejection is seen immediately
+        if result:
+            self._approval_cache[key] = (result, time.monotonic())
+        return result
+
     def check_erc1155_approval(self, owner: str, operator: str) -> bool:
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "operator", "type": "address"}],
-                "name": "isApprovedForAll", "outputs": [{"type": "bool"}], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CONDITIONAL_TOKENS), abi=abi)
-        return ctf.functions.isApprovedForAll(
-            Web3.to_checksum_address(owner), Web3.to_checksum_address(operator)).call()
+        key = (owner.lower(), operator.lower(), 'ctf')
+        cached = self._cached_approval(key)
+        if cached is not None:
+            return cached
+        return self._store_approval(key, self._ctf.functions.isApprovedForAll(
+            Web3.to_checksum_address(owner), Web3.to_checksum_address(operator)).call())
 
     def check_erc20_approval(self, owner: str, spender: str) -> int:
-        abi = [{"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
-                "name": "allowance", "outputs": [{"type": "uint256"}], "type": "function"}]
-        usdt = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDT_ADDRESS), abi=abi)
-        return usdt.functions.allowance(
-            Web3.to_checksum_address(owner), Web3.to_checksum_address(spender)).call()
+        key = (owner.lower(), spender.lower(), 'usdt')
+        cached = self._cached_approval(key)
+        if cached is not None:
+            return cached
+        return self._store_approval(key, self._usdt.functions.allowance(
+            Web3.to_checksum_address(owner), Web3.to_checksum_address(spender)).call())
 
     def set_erc1155_approval(self, owner: str, operator: str) -> str:
-        abi = [{"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}],
-                "name": "setApprovalForAll", "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CONDITIONAL_TOKENS), abi=abi)
-        data = ctf.encode_abi('setApprovalForAll', [Web3.to_checksum_address(operator), True])
-        return self.exec_transaction(to=self.CONDITIONAL_TOKENS, value=0, data=bytes.fromhex(data[2:]))
+        data = self._ctf.encode_abi('setApprovalForAll', [Web3.to_checksum_address(operator), True])
+        h = self.exec_transaction(to=self.CONDITIONAL_TOKENS, value=0, data=bytes.fromhex(data[2:]))
+        self._approval_cache.pop((owner.lower(), operator.lower(), 'ctf'), None)
+        return h
 
     def set_erc20_approval(self, owner: str, spender: str, amount: int = None) -> str:
         if amount is None:
             amount = 2**256 - 1
-        abi = [{"inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}],
-                "name": "approve", "outputs": [{"type": "bool"}], "type": "function"}]
-        usdt = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDT_ADDRESS), abi=abi)
-        data = usdt.encode_abi('approve', [Web3.to_checksum_address(spender), amount])
-        return self.exec_transaction(to=self.USDT_ADDRESS, value=0, data=bytes.fromhex(data[2:]))
+        data = self._usdt.encode_abi('approve', [Web3.to_checksum_address(spender), amount])
+        h = self.exec_transaction(to=self.USDT_ADDRESS, value=0, data=bytes.fromhex(data[2:]))
+        self._approval_cache.pop((owner.lower(), spender.lower(), 'usdt'), None)
+        return h
 
     # --- Orderbook Methods ---
 
@@ -287,10 +516,11 @@ class OpinionAdapter(BaseAdapter):
         if response.errno != 0:
             return {"bids": [], "asks": []}
         book = response.result
-        bids = sorted([{"price": float(b.price), "size": float(b.size)} for b in (book.bids or [])],
-                       key=lambda x: x['price'], reverse=True)
-        asks = sorted([{"price": float(a.price), "size": float(a.size)} for a in (book.asks or [])],
-                       key=lambda x: x['price'])
+        # Sort the raw levels, then build each dict once in final order
+        bids = [{"price": float(b.price), "size": float(b.size)}
+                for b in sorted(book.bids or [], key=lambda b: float(b.price), reverse=True)]
+        asks = [{"price": float(a.price), "size": float(a.size)}
+                for a in sorted(book.asks or [], key=lambda a: float(a.price))]
         return {"bids": bids, "asks": asks}
 
     def get_best_offer(self, token_id: str, side: str) -> dict:
@@ -311,9 +541,9 @@ class OpinionAdapter(BaseAdapter):
         if response.errno != 0:
             raise Exception(f"Failed to get order: {response.errmsg}")
         order = response.result.order_data
-        original = int(float(order.order_amount) * 1e18) if order.order_amount else 0
-        filled = int(float(order.filled_amount) * 1e18) if order.filled_amount else 0
-        filled_shares = int(float(order.filled_shares) * 1e18) if hasattr(order, 'filled_shares') and order.filled_shares else 0
+        original = _to_wei_18(order.order_amount) if order.order_amount else 0
+        filled = _to_wei_18(order.filled_amount) if order.filled_amount else 0
+        filled_shares = _to_wei_18(order.filled_shares) if hasattr(order, 'filled_shares') and order.filled_shares else 0
         status_map = {1: "OPEN", 2: "FILLED", 3: "CANCELLED", 4: "EXPIRED"}
         return {
             "order_id": order_id,
@@ -326,70 +556,128 @@ class OpinionAdapter(BaseAdapter):
             "price": float(order.price) if order.price else 0,
         }
 
-    def find_incoming_erc1155(self, token_id: str, expected_amount: int, blocks_back: int = 50) -> dict:
+    def _logs_newest_first(self, address: str, topics: list, blocks_back: int):
+        """Yield logs newest-first from one full-range query (not-found costs 2 RPCs);
+        falls back to LOG_SCAN_WINDOW windows if the node rejects the range."""
         current_block = self.w3.eth.block_number
         from_block = max(0, current_block - blocks_back)
-        sig = '0x' + self.w3.keccak(text="TransferSingle(address,address,address,uint256,uint256)").hex()
-        wallet = self.smart_wallet
-        logs = self.w3.eth.get_logs({
-            'fromBlock': from_block, 'toBlock': 'latest',
-            'address': Web3.to_checksum_address(self.CONDITIONAL_TOKENS),
-            'topics': [sig, None, None, '0x' + wallet[2:].lower().zfill(64)],
-        })
-        for log in reversed(logs):
-            data = log['data'].hex() if isinstance(log['data'], bytes) else log['data']
-            if data.startswith('0x'):
-                data = data[2:]
-            log_tid = int(data[0:64], 16)
-            log_val = int(data[64:128], 16)
-            if str(log_tid) == token_id and log_val >= expected_amount * 0.95:
-                h = log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash']
-                return {"found": True, "tx_hash": '0x' + h if not h.startswith('0x') else h, "amount": log_val, "block": log['blockNumber']}
+        try:
+            logs = self.w3.eth.get_logs({
+                'fromBlock': from_block, 'toBlock': current_block, 'address': address, 'topics': topics,
+            })
+        except Exception as e:
+            logger.warning(f"get_logs over {blocks_back} blocks refused, scanning in windows: {e}")
+        else:
+            yield from reversed(logs)
+            return
+        to_block = current_block
+        while to_block >= from_block:
+            start = max(from_block, to_block - self.LOG_SCAN_WINDOW + 1)
+            logs = self.w3.eth.get_logs({
+                'fromBlock': start, 'toBlock': to_block, 'address': address, 'topics': topics,
+            })
+            yield from reversed(logs)
+            to_block = start - 1
+
+    async def watch_incoming(self, ws_url: str = None):
+        """Opt-in background task feeding find_incoming_* from eth_subscribe (BSC_WS_URL); see TransferWatcher."""
+        # Transfer carries `to` in topic 2, TransferSingle in topic 3, so they need separate filters
+        filters = {
+            'erc20': {'address': self._usdt.address, 'topics': [self.TRANSFER_TOPIC, None, self._wallet_topic]},
+            'erc1155': {'address': self._ctf.address,
+                        'topics': [self.TRANSFER_SINGLE_TOPIC, None, None, self._wallet_topic]},
+        }
+        await self._watcher.run(ws_url, 'BSC_WS_URL', filters, 'Opinion')
+
+    def find_incoming_erc1155(self, token_id: str, expected_amount: int, blocks_back: int = 50) -> dict:
+        tid = int(token_id)
+        min_amount = expected_amount * 0.95
+        pushed = self._watcher.pushed(tid, min_amount, blocks_back)
+        if pushed is not None:
+            return pushed
+        topics = [self.TRANSFER_SINGLE_TOPIC, None, None, self._wallet_topic]
+        for log in self._logs_newest_first(self.CONDITIONAL_TOKENS, topics, blocks_back):
+            data = as_bytes(log['data'])
+            if int.from_bytes(data[0:32], 'big') != tid:
+                continue
+            log_val = int.from_bytes(data[32:64], 'big')
+            if log_val >= min_amount:
+                tx_hash = '0x' + as_bytes(log['transactionHash']).hex()
+                return {"found": True, "tx_hash": tx_hash, "amount": log_val, "block": log['blockNumber']}
         return {"found": False, "tx_hash": None, "amount": 0, "block": 0}
 
     def find_incoming_erc20(self, expected_amount: int, blocks_back: int = 50) -> dict:
-        current_block = self.w3.eth.block_number
-        from_block = max(0, current_block - blocks_back)
-        sig = '0x' + self.w3.keccak(text="Transfer(address,address,uint256)").hex()
-        wallet = self.smart_wallet
-        logs = self.w3.eth.get_logs({
-            'fromBlock': from_block, 'toBlock': 'latest',
-            'address': Web3.to_checksum_address(self.USDT_ADDRESS),
-            'topics': [sig, None, '0x' + wallet[2:].lower().zfill(64)],
-        })
-        for log in reversed(logs):
-            data = log['data'].hex() if isinstance(log['data'], bytes) else log['data']
-            if data.startswith('0x'):
-                data = data[2:]
-            val = int(data, 16)
-            if val >= expected_amount * 0.95:
-                h = log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash']
-                return {"found": True, "tx_hash": '0x' + h if not h.startswith('0x') else h, "amount": val, "block": log['blockNumber']}
+        min_amount = expected_amount * 0.95
+        pushed = self._watcher.pushed(None, min_amount, blocks_back)
+        if pushed is not None:
+            return pushed
+        topics = [self.TRANSFER_TOPIC, None, self._wallet_topic]
+        for log in self._logs_newest_first(self.USDT_ADDRESS, topics, blocks_back):
+            val = int.from_bytes(as_bytes(log['data'])[0:32], 'big')
+            if val >= min_amount:
+                tx_hash = '0x' + as_bytes(log['transactionHash']).hex()
+                return {"found": True, "tx_hash": tx_hash, "amount": val, "block": log['blockNumber']}
         return {"found": False, "tx_hash": None, "amount": 0, "block": 0}
 
+    def _approval_state(self, owner: str) -> tuple:
+        """(isApprovedForAll, USDT allowance) of owner towards the main EOA in one multicall round-trip."""
+        args = encode(['address', 'address'], [Web3.to_checksum_address(owner), self._main_relayer_address])
+        (ctf_ok, ctf_ret), (usdt_ok, usdt_ret) = multicall3(self.w3, [
+            (self._ctf.address, SEL_IS_APPROVED_FOR_ALL + args),
+            (self._usdt.address, SEL_ALLOWANCE + args),
+        ])
+        return ctf_ok and int.from_bytes(ctf_ret, 'big') == 1, int.from_bytes(usdt_ret, 'big') if usdt_ok else 0
+
     def check_user_approval(self, user_address: str) -> Dict[str, bool]:
         main_eoa = self._main_relayer_address
-        results = {}
+        ctf_key = (user_address.lower(), main_eoa.lower(), 'ctf')
+        usdt_key = (user_address.lower(), main_eoa.lower(), 'usdt')
+        ctf_cached, usdt_cached = self._cached_approval(ctf_key), self._cached_approval(usdt_key)
+        if ctf_cached is not None and usdt_cached is not None:
+            return {'ctf': True, 'usdt': True}
         try:
-            results['ctf'] = self.check_erc1155_approval(user_address, main_eoa)
-        except:
-            results['ctf'] = False
-        try:
-            results['usdt'] = self.check_erc20_approval(user_address, main_eoa) > 0
-        except:
-            results['usdt'] = False
-        return results
+            ctf, allowance = self._approval_state(user_address)
+        except Exception as e:
+            logger.error(f"Approval multicall failed: {e}")
+            return {'ctf': False, 'usdt': False}
+        ctf = self._store_approval(ctf_key, ctf)
+        allowance = self._store_approval(usdt_key, allowance)
+        return {'ctf': ctf, 'usdt': allowance > 0}
 
     def setup_approvals(self) -> Dict[str, str]:
-        """Setup approvals for main EOA to spend tokens from smart wallet."""
-        results = {}
+        """Setup approvals for main EOA to spend tokens from smart wallet (one Safe tx via MultiSend).
+
+        Approvals already in place are skipped; nothing is sent if both are set.
+        """
         main_eoa = self._main_relayer_address
         try:
-            results['usdt'] = self.set_erc20_approval(self.smart_wallet, main_eoa)
+            ctf_set, allowance = self._approval_state(self.smart_wallet)
         except Exception as e:
-            results['usdt'] = f"error: {e}"
+            logger.warning(f"Approval pre-check failed, approving both: {e}")
+            ctf_set, allowance = False, 0
+        results = {}
+        calls = []
+        if allowance >= 2**255:
+            results['usdt'] = 'already set'
+        else:
+            approve = self._usdt.encode_abi('approve', [main_eoa, 2**256 - 1])
+            calls.append(('usdt', (0, self._usdt.address, 0, bytes.fromhex(approve[2:]))))
+        if ctf_set:
+            results['ctf'] = 'already set'
+        else:
+            set_all = self._ctf.encode_abi('setApprovalForAll', [main_eoa, True])
+            calls.append(('ctf', (0, self._ctf.address, 0, bytes.fromhex(set_all[2:]))))
+        if not calls:
+            return results
         try:
-            results['ctf'] = self.set_erc1155_approval(self.smart_wallet, main_eoa)
+            if len(calls) == 1:
+                _, (_, to, value, data) = calls[0]
+                h = self.exec_transaction(to=to, value=value, data=data)
+            else:
+                h = self.exec_multisend([c for _, c in calls])
+            for name, _ in calls:
+                results[name] = h
         except Exception as e:
-            results['ctf'] = f"error: {e}"
+            for name, _ in calls:
+                results[name] = f"error: {e}"
         return results
@@ -2,24 +2,80 @@
 Polymarket trading adapter
 Handles token purchases on Polymarket CLOB using EOA directly
 """
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, Any
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import (
-    MarketOrderArgs,
-    PartialCreateOrderOptions,
-    BalanceAllowanceParams,
-    AssetType,
-    OrderType,
-)
-from py_clob_client.order_builder.constants import BUY, SELL
-
-from .base import BaseAdapter
+from web3.exceptions import MethodUnavailable
+from eth_account import Account
+from eth_abi import encode
+
+from .base import BaseAdapter, TransferWatcher, as_bytes, multicall3, SEL_ALLOWANCE, SEL_IS_APPROVED_FOR_ALL
 
 logger = logging.getLogger(__name__)
 
+# py_clob_client names, imported on first CLOB use so importing the adapter stays cheap
+_ClobClient = _MarketOrderArgs = _PartialCreateOrderOptions = _ApiCreds = None
+_BalanceAllowanceParams = _AssetType = _OrderType = _BUY = _SELL = _PolyApiException = None
+
+
+def _ensure_clob():
+    global _ClobClient, _MarketOrderArgs, _PartialCreateOrderOptions, _ApiCreds
+    global _BalanceAllowanceParams, _AssetType, _OrderType, _BUY, _SELL, _PolyApiException
+    if _ClobClient is None:
+        from py_clob_client.client import ClobClient
+        from py_clob_client.clob_types import (
+            MarketOrderArgs, PartialCreateOrderOptions, ApiCreds, BalanceAllowanceParams, AssetType, OrderType,
+        )
+        from py_clob_client.order_builder.constants import BUY, SELL
+        from py_clob_client.exceptions import PolyApiException
+        _ClobClient, _MarketOrderArgs, _PartialCreateOrderOptions, _ApiCreds = (
+            ClobClient, MarketOrderArgs, PartialCreateOrderOptions, ApiCreds,
+        )
+        _BalanceAllowanceParams, _AssetType, _OrderType, _BUY, _SELL, _PolyApiException = (
+            BalanceAllowanceParams, AssetType, OrderType, BUY, SELL, PolyApiException,
+        )
+
+
+@lru_cache(maxsize=1024)
+def _checksum(address: str) -> str:
+    """Memoized Web3.to_checksum_address; the same few addresses recur on every call."""
+    return Web3.to_checksum_address(address)
+
+
+def _as_0x(h) -> str:
+    """0x-prefixed hex for a tx hash; HexBytes.hex() includes the prefix on some versions and not others."""
+    h = h.hex() if isinstance(h, (bytes, bytearray)) else h
+    return h if h.startswith("0x") else "0x" + h
+
+
+# ABIs parsed once at import; contracts are built per adapter in __init__
+ERC20_ABI = [
+    {"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"type": "uint256"}], "type": "function"},
+    {"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}], "name": "allowance", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "approve", "outputs": [{"type": "bool"}], "type": "function"},
+    {"inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "transfer", "outputs": [{"type": "bool"}], "type": "function"},
+    {"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "transferFrom", "outputs": [{"type": "bool"}], "type": "function"},
+]
+CTF_ABI = [
+    {"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}], "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "account", "type": "address"}, {"name": "operator", "type": "address"}], "name": "isApprovedForAll", "outputs": [{"name": "", "type": "bool"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}], "name": "setApprovalForAll", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"}, {"name": "data", "type": "bytes"}], "name": "safeTransferFrom", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+]
+
 
 class PolymarketAdapter(BaseAdapter):
     """
@@ -44,22 +100,99 @@ class PolymarketAdapter(BaseAdapter):
     NEG_RISK_EXECUTOR = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
     USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 
+    # Event topics for incoming-transfer scans
+    TRANSFER_SINGLE_TOPIC = "0x" + Web3.keccak(text="TransferSingle(address,address,address,uint256,uint256)").hex()
+    TRANSFER_TOPIC = "0x" + Web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+    # Max eth_calls per JSON-RPC batch POST
+    BATCH_SIZE = 20
+    # Seconds a CLOB balance/allowance refresh is trusted before the next order repeats it
+    BALANCE_REFRESH_TTL = 2.0
+    # Block span per eth_getLogs request when scanning for incoming transfers
+    LOG_CHUNK = 500
+    # Polygon block time, used to age out transfers pushed by the WebSocket watcher
+    BLOCK_TIME = 2
+
+    # Keep-alive HTTP session shared by every adapter instance's RPC provider
+    _session = None
+
+    @classmethod
+    def _http_session(cls) -> requests.Session:
+        if cls._session is None:
+            session = requests.Session()
+            # urllib3 only retries POST on connection errors, so a sent tx is never replayed
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64,
+                                  max_retries=Retry(total=3, backoff_factor=0.2))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Connection": "keep-alive"})
+            cls._session = session
+        return cls._session
+
+    # HTTP/2 keep-alive client for direct CLOB REST calls; one connection multiplexes every request
+    _clob_http = None
+
+    @classmethod
+    def _clob_http_client(cls) -> httpx.Client:
+        if cls._clob_http is None:
+            cls._clob_http = httpx.Client(base_url=cls.API_BASE, http2=True, timeout=10)
+        return cls._clob_http
+
+    # Async sibling of _clob_http, keyed by the event loop it was opened on (httpx async clients can't cross loops)
+    _clob_ahttp = None
+    _clob_ahttp_loop = None
+
+    @classmethod
+    async def _clob_async_client(cls) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if cls._clob_ahttp is None or cls._clob_ahttp_loop is not loop:
+            stale = cls._clob_ahttp
+            cls._clob_ahttp = httpx.AsyncClient(base_url=cls.API_BASE, http2=True, timeout=10)
+            cls._clob_ahttp_loop = loop
+            if stale is not None:
+                try:
+                    await stale.aclose()
+                except Exception as e:
+                    logger.debug(f"Closing stale CLOB async client: {e}")
+        return cls._clob_ahttp
+
+    @classmethod
+    async def aclose_clob(cls):
+        """Close the shared async CLOB client; call before the owning event loop shuts down."""
+        if cls._clob_ahttp is not None:
+            client, cls._clob_ahttp, cls._clob_ahttp_loop = cls._clob_ahttp, None, None
+            await client.aclose()
+
     def __init__(self, private_key: str, proxy_wallet: str, rpc_url: str = None):
         if not private_key.startswith("0x"):
             private_key = "0x" + private_key
         self.private_key = private_key
         self.proxy_wallet = proxy_wallet
         self.rpc_url = rpc_url
+        self._proxy = _checksum(proxy_wallet)
+        self._proxy_topic = "0x" + self._proxy[2:].lower().zfill(64)
 
         if rpc_url:
-            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=self._http_session()))
             self.account = self.w3.eth.account.from_key(private_key)
+            self._ctf = self.w3.eth.contract(address=_checksum(self.CTF_ADDRESS), abi=CTF_ABI)
+            self._usdc = self.w3.eth.contract(address=_checksum(self.USDC_ADDRESS), abi=ERC20_ABI)
         else:
             self.w3 = None
             self.account = None
+            self._ctf = None
+            self._usdc = None
 
         self._client = None
         self._authenticated = False
+        # token_id -> neg_risk; fixed for a deployed market
+        self._neg_risk = {}
+        self._last_balance_refresh = 0.0
+        self._conditional_refresh = {}
+        # Incoming transfers pushed by watch_incoming()
+        self._watcher = TransferWatcher(self.BLOCK_TIME, maxlen=1024)
+        # Worker threads for the pre-trade reads that place_order overlaps
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="polymarket-io")
 
     # --- Auth ---
 
@@ -73,28 +206,61 @@ class PolymarketAdapter(BaseAdapter):
             return False
 
     @property
-    def client(self) -> ClobClient:
+    def client(self) -> "_ClobClient":
         if self._client is None:
             self.authenticate()
         return self._client
 
-    def _create_client(self) -> ClobClient:
-        temp_client = ClobClient(
+    def _creds_path(self) -> str:
+        """Per-(signer, chain) file for derived CLOB API creds; keyed by address hash, never the key."""
+        address = Account.from_key(self.private_key).address
+        fp = hashlib.sha256(f"{address.lower()}:{self.CHAIN_ID}".encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser("~/.cache/polymarket"), f"{fp}.json")
+
+    def _load_creds(self):
+        try:
+            with open(self._creds_path()) as f:
+                return _ApiCreds(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save_creds(self, creds: "_ApiCreds"):
+        path = self._creds_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"api_key": creds.api_key, "api_secret": creds.api_secret,
+                           "api_passphrase": creds.api_passphrase}, f)
+        except OSError as e:
+            logger.warning(f"Could not cache Polymarket API creds: {e}")
+
+    def _derive_creds(self) -> "_ApiCreds":
+        _ensure_clob()
+        temp_client = _ClobClient(
             host=self.API_BASE,
             key=self.private_key,
             chain_id=self.CHAIN_ID,
         )
         api_creds = temp_client.create_or_derive_api_creds()
+        self._save_creds(api_creds)
+        return api_creds
+
+    def _create_client(self, api_creds: "_ApiCreds" = None) -> "_ClobClient":
+        _ensure_clob()
+        cached = api_creds is None and self._load_creds()
+        if api_creds is None:
+            api_creds = cached or self._derive_creds()
 
         if self.USE_EOA_DIRECTLY:
-            client = ClobClient(
+            client = _ClobClient(
                 host=self.API_BASE,
                 key=self.private_key,
                 chain_id=self.CHAIN_ID,
                 creds=api_creds,
             )
         else:
-            client = ClobClient(
+            client = _ClobClient(
                 host=self.API_BASE,
                 key=self.private_key,
                 chain_id=self.CHAIN_ID,
@@ -103,10 +269,15 @@ class PolymarketAdapter(BaseAdapter):
                 signature_type=2,
             )
 
+        # First L2 call doubles as a check of cached creds; a 401 means they were revoked
         try:
             client.update_balance_allowance(
-                BalanceAllowanceParams(asset_type=AssetType.COLLATERAL)
+                _BalanceAllowanceParams(asset_type=_AssetType.COLLATERAL)
             )
+        except _PolyApiException as e:
+            if cached and e.status_code == 401:
+                logger.warning("Cached Polymarket API creds rejected, re-deriving")
+                return self._create_client(self._derive_creds())
         except Exception:
             pass
 
@@ -114,83 +285,143 @@ class PolymarketAdapter(BaseAdapter):
 
     # --- Approvals ---
 
-    def ensure_approvals(self, neg_risk: bool = False) -> Dict[str, bool]:
-        if not self.w3 or not self.account:
-            logger.warning("Web3 not initialized, cannot check approvals")
-            return {}
-
-        ctf_abi = [
-            {"inputs": [{"name": "account", "type": "address"}, {"name": "operator", "type": "address"}], "name": "isApprovedForAll", "outputs": [{"name": "", "type": "bool"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}], "name": "setApprovalForAll", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
-        ]
-        erc20_abi = [
-            {"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}], "name": "allowance", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "approve", "outputs": [{"type": "bool"}], "type": "function"},
-        ]
-
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=ctf_abi)
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=erc20_abi)
-
-        approvals = {}
+    def _approval_contracts(self, neg_risk: bool) -> list:
         contracts = [
             ("Regular Exchange", self.CTF_EXCHANGE_REGULAR),
             ("NegRisk Exchange", self.CTF_EXCHANGE_NEGRISK),
         ]
         if neg_risk:
             contracts.append(("NegRisk Executor", self.NEG_RISK_EXECUTOR))
+        return contracts
+
+    def _approval_calls(self, contracts: list) -> list:
+        owner = self.account.address
+        calls = []
+        for name, addr in contracts:
+            args = encode(["address", "address"], [owner, _checksum(addr)])
+            calls.append((self._usdc.address, SEL_ALLOWANCE + args))
+            calls.append((self._ctf.address, SEL_IS_APPROVED_FOR_ALL + args))
+        return calls
+
+    @staticmethod
+    def _parse_approval_state(contracts: list, results: list) -> tuple:
+        """Multicall results -> ({name: allowance}, {name: isApprovedForAll}); failed sub-calls are left out."""
+        allowances, operator_ok = {}, {}
+        for i, (name, addr) in enumerate(contracts):
+            (a_ok, a_ret), (c_ok, c_ret) = results[2 * i], results[2 * i + 1]
+            if a_ok:
+                allowances[name] = int.from_bytes(a_ret, "big")
+            if c_ok:
+                operator_ok[name] = int.from_bytes(c_ret, "big") == 1
+        return allowances, operator_ok
+
+    def _approval_state(self) -> tuple:
+        """Approval state for all three operators (incl. NegRisk Executor) in one multicall."""
+        contracts = self._approval_contracts(neg_risk=True)
+        results = multicall3(self.w3, self._approval_calls(contracts))
+        return self._parse_approval_state(contracts, results)
+
+    def ensure_approvals(self, neg_risk: bool = False, state: tuple = None) -> Dict[str, bool]:
+        """Approve any exchange missing USDC allowance / CTF operator rights. `state` reuses a prior read."""
+        if not self.w3 or not self.account:
+            logger.warning("Web3 not initialized, cannot check approvals")
+            return {}
+
+        ctf = self._ctf
+        usdc = self._usdc
+
+        approvals = {}
+        contracts = self._approval_contracts(neg_risk)
 
         max_uint = 2**256 - 1
+        owner = self.account.address
 
-        # USDC approvals
+        # Read every allowance / isApprovedForAll in one Multicall3 round-trip before deciding on writes
+        allowances, operator_ok = state or ({}, {})
+        if state is None:
+            try:
+                results = multicall3(self.w3, self._approval_calls(contracts))
+                allowances, operator_ok = self._parse_approval_state(contracts, results)
+            except Exception as e:
+                logger.warning(f"Approval multicall failed, falling back to single reads: {e}")
+
+        # Work out every missing approval first
+        needed = []
         for name, addr in contracts:
             try:
-                allowance = usdc.functions.allowance(
-                    Web3.to_checksum_address(self.account.address),
-                    Web3.to_checksum_address(addr),
-                ).call()
+                allowance = allowances.get(name)
+                if allowance is None:
+                    allowance = usdc.functions.allowance(owner, _checksum(addr)).call()
                 if allowance < 10**12:
                     logger.warning(f"USDC allowance for {name} low, approving...")
-                    nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
-                    tx = usdc.functions.approve(Web3.to_checksum_address(addr), max_uint).build_transaction({
-                        "from": self.account.address, "nonce": nonce, "gas": 100000,
-                        "gasPrice": self.w3.eth.gas_price, "chainId": self.CHAIN_ID,
-                    })
-                    signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
-                    tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-                    receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                    approvals[f"USDC-{name}"] = receipt["status"] == 1
+                    needed.append((f"USDC-{name}", usdc.functions.approve(_checksum(addr), max_uint)))
                 else:
                     approvals[f"USDC-{name}"] = True
             except Exception as e:
                 logger.error(f"USDC approval for {name} failed: {e}")
                 approvals[f"USDC-{name}"] = False
-
-        # CTF approvals
         for name, addr in contracts:
             try:
-                ok = ctf.functions.isApprovedForAll(
-                    Web3.to_checksum_address(self.account.address),
-                    Web3.to_checksum_address(addr),
-                ).call()
+                ok = operator_ok.get(name)
+                if ok is None:
+                    ok = ctf.functions.isApprovedForAll(owner, _checksum(addr)).call()
                 if not ok:
                     logger.warning(f"{name} not approved, approving...")
-                    nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
-                    tx = ctf.functions.setApprovalForAll(Web3.to_checksum_address(addr), True).build_transaction({
-                        "from": self.account.address, "nonce": nonce, "gas": 100000,
-                        "gasPrice": self.w3.eth.gas_price, "chainId": self.CHAIN_ID,
-                    })
-                    signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
-                    tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-                    receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                    approvals[name] = receipt["status"] == 1
+                    needed.append((name, ctf.functions.setApprovalForAll(_checksum(addr), True)))
                 else:
                     approvals[name] = True
             except Exception as e:
                 logger.error(f"CTF approval for {name} failed: {e}")
                 approvals[name] = False
+        if not needed:
+            return approvals
+
+        # Sign with a contiguous nonce range from one pending-nonce read, broadcast in nonce order,
+        # then wait for all receipts in parallel so confirmation takes ~1 block instead of N
+        try:
+            fees = self._eip1559_fees()
+            nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
+        except Exception as e:
+            logger.error(f"Approval gas/nonce read failed: {e}")
+            approvals.update({key: False for key, _ in needed})
+            return approvals
+        sent = []
+        for key, fn in needed:
+            try:
+                tx = fn.build_transaction({
+                    "from": self.account.address, "nonce": nonce, "gas": 100000,
+                    "chainId": self.CHAIN_ID, **fees,
+                })
+                signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
+                sent.append((key, self.w3.eth.send_raw_transaction(signed.raw_transaction)))
+                nonce += 1
+            except Exception as e:
+                # Later txs would sit behind a nonce gap; leave them for the next run
+                logger.error(f"Approval {key} failed: {e}")
+                approvals[key] = False
+                for later_key, _ in needed[len(sent) + 1:]:
+                    approvals[later_key] = False
+                break
+
+        with ThreadPoolExecutor(max_workers=len(sent) or 1) as pool:
+            futures = {key: pool.submit(self.w3.eth.wait_for_transaction_receipt, h, timeout=120) for key, h in sent}
+            for key, fut in futures.items():
+                try:
+                    approvals[key] = fut.result()["status"] == 1
+                except Exception as e:
+                    logger.error(f"Approval {key} receipt failed: {e}")
+                    approvals[key] = False
 
         return approvals
 
+    def _eip1559_fees(self) -> dict:
+        """maxFeePerGas / maxPriorityFeePerGas from the last 5 blocks' fee history (p50 tip, 30 gwei floor)."""
+        fh = self.w3.eth.fee_history(5, "latest", [50])
+        base = fh["baseFeePerGas"][-1]
+        tips = sorted(r[0] for r in fh["reward"] if r)
+        tip = max(int(30e9), tips[len(tips) // 2] if tips else 0)
+        return {"maxFeePerGas": base * 2 + tip, "maxPriorityFeePerGas": tip}
+
     # --- Place Order ---
 
     def place_order(
@@ -202,141 +433,175 @@ class PolymarketAdapter(BaseAdapter):
         side: str,
         condition_id: str = None,
     ) -> Dict[str, Any]:
+        _ensure_clob()
         client = self.client
+        neg_risk = self._prepare_order(client, token_id, side)
 
-        neg_risk = False
-        try:
-            neg_risk = client.get_neg_risk(token_id)
-            logger.info(f"Token {token_id[:20]}... neg_risk: {neg_risk}")
-        except Exception as e:
-            logger.warning(f"Failed to get neg_risk: {e}")
-
-        try:
-            approvals = self.ensure_approvals(neg_risk=neg_risk)
-            logger.info(f"Approvals: {approvals}")
-        except Exception as e:
-            logger.warning(f"Failed to ensure approvals: {e}")
-
-        # Update COLLATERAL balance cache
-        try:
-            client.update_balance_allowance(
-                BalanceAllowanceParams(asset_type=AssetType.COLLATERAL, signature_type=0)
-            )
-            bal = client.get_balance_allowance(
-                BalanceAllowanceParams(asset_type=AssetType.COLLATERAL, signature_type=0)
-            )
-            logger.info(f"COLLATERAL balance: {int(bal.get('balance', 0)) / 1e6:.4f} USDC")
-        except Exception as e:
-            logger.warning(f"Failed to update COLLATERAL balance: {e}")
-
-        # For SELL: update CONDITIONAL balance
-        if side.upper() == "SELL":
-            try:
-                client.update_balance_allowance(
-                    BalanceAllowanceParams(asset_type=AssetType.CONDITIONAL, token_id=token_id, signature_type=0)
-                )
-            except Exception as e:
-                logger.warning(f"Failed to update CONDITIONAL balance: {e}")
-
-        options = PartialCreateOrderOptions(neg_risk=neg_risk)
+        options = _PartialCreateOrderOptions(neg_risk=neg_risk)
 
-        import math
         # FOK: maker(USDC) max 2dp, taker(shares) max 4dp
         # create_market_order BUY: amount=USDC → maker=round_down(amount,2dp), taker=amount/price→4dp
+        # Floor in integer micro-units: float products like 0.29 * 100 would otherwise drop a cent
+        amount_micro = int(Decimal(str(amount)) * 10**6)
         if side.upper() == "BUY":
-            usdc_amount = math.floor(float(amount) * float(price) * 100) / 100  # USDC 2dp
+            usdc_amount = amount_micro * int(Decimal(str(price)) * 10**6) // 10**10 / 100  # USDC 2dp
         else:
-            usdc_amount = math.floor(float(amount) * 100) / 100  # shares 2dp
+            usdc_amount = amount_micro // 10**4 / 100  # shares 2dp
 
-        order_args = MarketOrderArgs(
+        order_args = _MarketOrderArgs(
             token_id=token_id,
             amount=usdc_amount,
             price=price,
-            side=BUY if side.upper() == "BUY" else SELL,
-            order_type=OrderType.FOK,
+            side=_BUY if side.upper() == "BUY" else _SELL,
+            order_type=_OrderType.FOK,
         )
 
         logger.info(f"Order (FOK): side={side.upper()}, price={price}, amount={usdc_amount}, neg_risk={neg_risk}")
         logger.info(f"Token: {token_id[:40]}...")
 
         signed_order = client.create_market_order(order_args, options=options)
-        response = client.post_order(signed_order, orderType=OrderType.FOK)
-
-        order_id = response.get("orderID") or response.get("orderId")
-        logger.info(f"Order placed: id={order_id}, status={response.get('status')}")
-
-        # Extract signed order params
-        order_data = signed_order.dict() if hasattr(signed_order, 'dict') else (
-            signed_order.__dict__ if hasattr(signed_order, '__dict__') else {}
-        )
-        response["_params"] = {
-            "salt": order_data.get("salt"),
-            "maker": order_data.get("maker"),
-            "signer": order_data.get("signer"),
-            "taker": order_data.get("taker"),
-            "tokenId": order_data.get("tokenId") or order_data.get("token_id") or token_id,
-            "makerAmount": order_data.get("makerAmount") or order_data.get("maker_amount"),
-            "takerAmount": order_data.get("takerAmount") or order_data.get("taker_amount"),
-            "expiration": order_data.get("expiration"),
-            "nonce": order_data.get("nonce"),
-            "feeRateBps": order_data.get("feeRateBps") or order_data.get("fee_rate_bps"),
-            "side": order_data.get("side"),
-            "signatureType": order_data.get("signatureType") or order_data.get("signature_type"),
-            "signature": order_data.get("signature"),
+        # Signed order params for the caller, built before submitting so nothing after post_order can raise.
+        # SignedOrder.dict() is the flat camelCase dict post_order sends; .get() keeps a renamed field non-fatal
+        od = signed_order.dict()
+        params = {
+            "salt": od.get("salt"),
+            "maker": od.get("maker"),
+            "signer": od.get("signer"),
+            "taker": od.get("taker"),
+            "tokenId": od.get("tokenId") or token_id,
+            "makerAmount": od.get("makerAmount"),
+            "takerAmount": od.get("takerAmount"),
+            "expiration": od.get("expiration"),
+            "nonce": od.get("nonce"),
+            "feeRateBps": od.get("feeRateBps"),
+            "side": od.get("side"),
+            "signatureType": od.get("signatureType"),
+            "signature": od.get("signature"),
             "neg_risk": neg_risk,
             "market_id": market_id,
             "price": price,
             "amount": amount,
             "order_amount": usdc_amount,
         }
+        response = client.post_order(signed_order, orderType=_OrderType.FOK)
+
+        order_id = response.get("orderID") or response.get("orderId")
+        logger.info(f"Order placed: id={order_id}, status={response.get('status')}")
+        response["_params"] = params
         return response
 
+    async def aplace_order(self, token_id: str, market_id: int, amount: float, price: float, side: str,
+                           condition_id: str = None) -> Dict[str, Any]:
+        """place_order off the event loop (signing + py_clob_client calls are blocking)"""
+        return await asyncio.to_thread(self.place_order, token_id, market_id, amount, price, side, condition_id)
+
+    def _prepare_order(self, client: "_ClobClient", token_id: str, side: str) -> bool:
+        """Pre-trade checks with independent I/O overlapped on the io pool. Returns neg_risk."""
+        def read_approvals():
+            if not self.w3 or not self.account:
+                return None
+            try:
+                return self._approval_state()
+            except Exception as e:
+                logger.warning(f"Approval multicall failed: {e}")
+                return None
+
+        # neg_risk (CLOB HTTP) and approval state (RPC over the keep-alive session) do not depend on each other
+        neg_risk_fut = self._io_pool.submit(self._get_neg_risk, token_id, client)
+        state = read_approvals()
+        neg_risk = False
+        try:
+            neg_risk = neg_risk_fut.result()
+            logger.info(f"Token {token_id[:20]}... neg_risk: {neg_risk}")
+        except Exception as e:
+            logger.warning(f"Failed to get neg_risk: {e}")
+
+        try:
+            approvals = self.ensure_approvals(neg_risk, state)
+            logger.info(f"Approvals: {approvals}")
+        except Exception as e:
+            logger.warning(f"Failed to ensure approvals: {e}")
+
+        # Balance cache refreshes run after approvals so the CLOB sees any new allowance
+        def refresh_collateral():
+            try:
+                client.update_balance_allowance(
+                    _BalanceAllowanceParams(asset_type=_AssetType.COLLATERAL, signature_type=0)
+                )
+                self._last_balance_refresh = time.monotonic()
+                if logger.isEnabledFor(logging.INFO):
+                    bal = client.get_balance_allowance(
+                        _BalanceAllowanceParams(asset_type=_AssetType.COLLATERAL, signature_type=0)
+                    )
+                    logger.info(f"COLLATERAL balance: {int(bal.get('balance', 0)) / 1e6:.4f} USDC")
+            except Exception as e:
+                logger.warning(f"Failed to update COLLATERAL balance: {e}")
+
+        # For SELL: update CONDITIONAL balance
+        def refresh_conditional():
+            try:
+                client.update_balance_allowance(
+                    _BalanceAllowanceParams(asset_type=_AssetType.CONDITIONAL, token_id=token_id, signature_type=0)
+                )
+                self._conditional_refresh[token_id] = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Failed to update CONDITIONAL balance: {e}")
+
+        # Orders a few seconds apart reuse the previous refresh
+        now = time.monotonic()
+        refreshes = []
+        if now - self._last_balance_refresh >= self.BALANCE_REFRESH_TTL:
+            refreshes.append(self._io_pool.submit(refresh_collateral))
+        if side.upper() == "SELL" and now - self._conditional_refresh.get(token_id, 0.0) >= self.BALANCE_REFRESH_TTL:
+            refreshes.append(self._io_pool.submit(refresh_conditional))
+        for f in refreshes:
+            f.result()
+        return neg_risk
+
+    def _get_neg_risk(self, token_id: str, client: "_ClobClient") -> bool:
+        if token_id not in self._neg_risk:
+            self._neg_risk[token_id] = client.get_neg_risk(token_id)
+        return self._neg_risk[token_id]
+
     # --- Market Info ---
 
     def get_market_info(self, condition_id: str) -> Dict[str, Any]:
         return self.client.get_market(condition_id)
 
     def check_token_type(self, token_id: str) -> bool:
-        client = ClobClient(host=self.API_BASE, key=self.private_key, chain_id=self.CHAIN_ID)
-        return client.get_neg_risk(token_id)
+        return self._get_neg_risk(token_id, self.client)
 
     # --- BaseAdapter Properties ---
 
     @property
     def relayer_address(self) -> str:
-        return Web3.to_checksum_address(self.proxy_wallet)
+        return self._proxy
 
     # --- Balances ---
 
     def get_stablecoin_balance(self, address: str = None) -> int:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        addr = Web3.to_checksum_address(address or self.proxy_wallet)
-        abi = [{"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"type": "uint256"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        return usdc.functions.balanceOf(addr).call()
+        addr = _checksum(address) if address else self._proxy
+        return self._usdc.functions.balanceOf(addr).call()
 
     def get_token_balance(self, address: str, token_id: str) -> int:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        return ctf.functions.balanceOf(Web3.to_checksum_address(address), int(token_id)).call()
+        return self._ctf.functions.balanceOf(_checksum(address), int(token_id)).call()
 
     # --- Transfers ---
 
     def _send_tx(self, tx) -> str:
         signed = self.account.sign_transaction(tx)
         tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        return "0x" + tx_hash.hex()
+        return _as_0x(tx_hash)
 
     def transfer_erc1155_to_user(self, user_address: str, token_id: str, amount_wei: int) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"}, {"name": "data", "type": "bytes"}], "name": "safeTransferFrom", "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        tx = ctf.functions.safeTransferFrom(proxy, Web3.to_checksum_address(user_address), int(token_id), amount_wei, b"").build_transaction({
+        proxy = self._proxy
+        tx = self._ctf.functions.safeTransferFrom(proxy, _checksum(user_address), int(token_id), amount_wei, b"").build_transaction({
             "from": proxy, "gas": 150000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -345,10 +610,8 @@ class PolymarketAdapter(BaseAdapter):
     def transfer_usdt_to_user(self, user_address: str, amount_wei: int) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-        abi = [{"inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "transfer", "outputs": [{"type": "bool"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        tx = usdc.functions.transfer(Web3.to_checksum_address(user_address), amount_wei).build_transaction({
+        proxy = self._proxy
+        tx = self._usdc.functions.transfer(_checksum(user_address), amount_wei).build_transaction({
             "from": proxy, "gas": 100000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -357,10 +620,8 @@ class PolymarketAdapter(BaseAdapter):
     def transfer_usdt_from_user(self, user_address: str, amount_wei: int) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "transferFrom", "outputs": [{"type": "bool"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        tx = usdc.functions.transferFrom(Web3.to_checksum_address(user_address), proxy, amount_wei).build_transaction({
+        proxy = self._proxy
+        tx = self._usdc.functions.transferFrom(_checksum(user_address), proxy, amount_wei).build_transaction({
             "from": proxy, "gas": 100000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -369,10 +630,8 @@ class PolymarketAdapter(BaseAdapter):
     def transfer_erc1155_from_user(self, user_address: str, token_id: str, amount_wei: int) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-        abi = [{"inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"}, {"name": "data", "type": "bytes"}], "name": "safeTransferFrom", "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        tx = ctf.functions.safeTransferFrom(Web3.to_checksum_address(user_address), proxy, int(token_id), amount_wei, b"").build_transaction({
+        proxy = self._proxy
+        tx = self._ctf.functions.safeTransferFrom(_checksum(user_address), proxy, int(token_id), amount_wei, b"").build_transaction({
             "from": proxy, "gas": 200000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -383,24 +642,18 @@ class PolymarketAdapter(BaseAdapter):
     def check_erc1155_approval(self, owner: str, operator: str) -> bool:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "operator", "type": "address"}], "name": "isApprovedForAll", "outputs": [{"name": "", "type": "bool"}], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        return ctf.functions.isApprovedForAll(Web3.to_checksum_address(owner), Web3.to_checksum_address(operator)).call()
+        return self._ctf.functions.isApprovedForAll(_checksum(owner), _checksum(operator)).call()
 
     def check_erc20_approval(self, owner: str, spender: str) -> int:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}], "name": "allowance", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        return usdc.functions.allowance(Web3.to_checksum_address(owner), Web3.to_checksum_address(spender)).call()
+        return self._usdc.functions.allowance(_checksum(owner), _checksum(spender)).call()
 
     def set_erc1155_approval(self, owner: str, operator: str) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-        abi = [{"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}], "name": "setApprovalForAll", "outputs": [], "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        tx = ctf.functions.setApprovalForAll(Web3.to_checksum_address(operator), True).build_transaction({
+        proxy = self._proxy
+        tx = self._ctf.functions.setApprovalForAll(_checksum(operator), True).build_transaction({
             "from": proxy, "gas": 100000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -409,12 +662,10 @@ class PolymarketAdapter(BaseAdapter):
     def set_erc20_approval(self, owner: str, spender: str, amount: int = None) -> str:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
+        proxy = self._proxy
         if amount is None:
             amount = 2**256 - 1
-        abi = [{"inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}], "name": "approve", "outputs": [{"type": "bool"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        tx = usdc.functions.approve(Web3.to_checksum_address(spender), amount).build_transaction({
+        tx = self._usdc.functions.approve(_checksum(spender), amount).build_transaction({
             "from": proxy, "gas": 100000, "gasPrice": self.w3.eth.gas_price,
             "nonce": self.w3.eth.get_transaction_count(proxy), "chainId": self.CHAIN_ID,
         })
@@ -426,43 +677,28 @@ class PolymarketAdapter(BaseAdapter):
         """Return raw CTF balance (6 decimals) for token_id on relayer wallet."""
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}],
-                "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        return ctf.functions.balanceOf(self.account.address, int(token_id)).call()
+        return self._ctf.functions.balanceOf(self.account.address, int(token_id)).call()
 
     def get_user_shares_balance(self, token_id: str, user_address: str) -> int:
         """Return raw CTF balance for token_id on any address."""
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "account", "type": "address"}, {"name": "id", "type": "uint256"}],
-                "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
-        return ctf.functions.balanceOf(Web3.to_checksum_address(user_address), int(token_id)).call()
+        return self._ctf.functions.balanceOf(_checksum(user_address), int(token_id)).call()
 
     def get_usdc_balance(self) -> int:
         """Return raw USDC.e balance (6 decimals) on relayer wallet."""
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf",
-                "outputs": [{"type": "uint256"}], "type": "function"}]
-        usdc = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS), abi=abi)
-        return usdc.functions.balanceOf(self.account.address).call()
+        return self._usdc.functions.balanceOf(self.account.address).call()
 
     def transfer_shares(self, token_id: str, to_address: str, amount: int) -> dict:
         """Transfer ERC1155 shares from relayer to user. Returns {tx_hash, success}."""
         if not self.w3 or not self.account:
             raise RuntimeError("Web3 not initialized")
-        abi = [{"inputs": [
-            {"name": "from", "type": "address"}, {"name": "to", "type": "address"},
-            {"name": "id", "type": "uint256"}, {"name": "amount", "type": "uint256"},
-            {"name": "data", "type": "bytes"}],
-            "name": "safeTransferFrom", "outputs": [], "stateMutability": "nonpayable", "type": "function"}]
-        ctf = self.w3.eth.contract(address=Web3.to_checksum_address(self.CTF_ADDRESS), abi=abi)
         gas_price = self.w3.eth.gas_price
-        tx = ctf.functions.safeTransferFrom(
+        tx = self._ctf.functions.safeTransferFrom(
             self.account.address,
-            Web3.to_checksum_address(to_address),
+            _checksum(to_address),
             int(token_id), amount, b"",
         ).build_transaction({
             "from": self.account.address,
@@ -475,47 +711,71 @@ class PolymarketAdapter(BaseAdapter):
         signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
         tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
         receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        h = "0x" + tx_hash.hex() if not tx_hash.hex().startswith("0x") else tx_hash.hex()
+        h = _as_0x(tx_hash)
         logger.info(f"Transfer shares tx={h}, status={receipt['status']}")
         return {"tx_hash": h, "success": receipt["status"] == 1}
 
     # --- Orderbook ---
 
+    @staticmethod
+    def _decode_book(resp) -> dict:
+        """Raw CLOB /book payload, decoded with orjson (full-depth books are the largest responses we parse)"""
+        if resp.status_code != 200:
+            raise Exception(f"Orderbook request failed: {resp.status_code} {resp.text}")
+        return orjson.loads(resp.content)
+
+    def _fetch_book(self, token_id: str) -> dict:
+        return self._decode_book(self._clob_http_client().get("/book", params={"token_id": token_id}))
+
+    async def _afetch_book(self, token_id: str) -> dict:
+        client = await self._clob_async_client()
+        return self._decode_book(await client.get("/book", params={"token_id": token_id}))
+
     def get_orderbook(self, token_id: str) -> dict:
-        book = self.client.get_order_book(token_id)
-        bids = sorted(
-            [{"price": float(b.price), "size": float(b.size)} for b in (book.bids or [])],
-            key=lambda x: x["price"], reverse=True,
-        )
-        asks = sorted(
-            [{"price": float(a.price), "size": float(a.size)} for a in (book.asks or [])],
-            key=lambda x: x["price"],
-        )
+        book = self._fetch_book(token_id)
+        f = float
+        bids = [{"price": f(b["price"]), "size": f(b["size"])} for b in (book.get("bids") or [])]
+        bids.sort(key=lambda x: x["price"], reverse=True)
+        asks = [{"price": f(a["price"]), "size": f(a["size"])} for a in (book.get("asks") or [])]
+        asks.sort(key=lambda x: x["price"])
         return {"bids": bids, "asks": asks}
 
-    def get_best_offer(self, token_id: str, side: str) -> dict:
-        book = self.get_orderbook(token_id)
+    @staticmethod
+    def _best_offer(book: dict, side: str) -> dict:
+        # Only the top level is needed: one O(N) scan instead of sorting the whole book
         if side.upper() == "BUY":
-            if book["asks"]:
-                return {"price": book["asks"][0]["price"], "size": book["asks"][0]["size"], "side": "BUY"}
+            levels = [(float(a["price"]), a) for a in (book.get("asks") or [])]
+            if levels:
+                price, best = min(levels, key=lambda x: x[0])
+                return {"price": price, "size": float(best["size"]), "side": "BUY"}
             return {"price": 0, "size": 0, "side": "BUY"}
         else:
-            if book["bids"]:
-                return {"price": book["bids"][0]["price"], "size": book["bids"][0]["size"], "side": "SELL"}
+            levels = [(float(b["price"]), b) for b in (book.get("bids") or [])]
+            if levels:
+                price, best = max(levels, key=lambda x: x[0])
+                return {"price": price, "size": float(best["size"]), "side": "SELL"}
             return {"price": 0, "size": 0, "side": "SELL"}
 
+    def get_best_offer(self, token_id: str, side: str) -> dict:
+        return self._best_offer(self._fetch_book(token_id), side)
+
+    async def aget_best_offer(self, token_id: str, side: str) -> dict:
+        """get_best_offer over the HTTP/2 async client"""
+        return self._best_offer(await self._afetch_book(token_id), side)
+
     # --- Order Status ---
 
     def get_order(self, order_id: str, token_id: str = None) -> dict:
         order = self.client.get_order(order_id)
-        original = float(order.get("original_size", 0))
-        matched = float(order.get("size_matched", 0))
+        # Sizes come as decimal strings; scale exactly to 6-decimal units instead of float * 1e6
+        original = int(Decimal(str(order.get("original_size", 0))) * 10**6)
+        matched = int(Decimal(str(order.get("size_matched", 0))) * 10**6)
         return {
             "order_id": order.get("id"),
             "status": order.get("status"),
-            "original_amount": int(original * 1e6),
-            "filled_amount": int(matched * 1e6),
-            "remaining_amount": int((original - matched) * 1e6),
+            "original_amount": original,
+            "filled_amount": matched,
+            "remaining_amount": original - matched,
             "side": order.get("side"),
             "price": float(order.get("price", 0)),
             "raw": order,
@@ -523,73 +783,103 @@ class PolymarketAdapter(BaseAdapter):
 
     # --- Find Incoming Transfers ---
 
-    def find_incoming_erc1155(self, token_id: str, expected_amount: int, blocks_back: int = 50) -> dict:
-        if not self.w3:
-            raise RuntimeError("Web3 not initialized")
+    async def watch_incoming(self, ws_url: str = None):
+        """Opt-in background task feeding find_incoming_* from eth_subscribe (POLYGON_WS_URL); see TransferWatcher."""
+        # Transfer carries `to` in topic 2, TransferSingle in topic 3, so they need separate filters
+        filters = {
+            "erc20": {"address": self._usdc.address, "topics": [self.TRANSFER_TOPIC, None, self._proxy_topic]},
+            "erc1155": {"address": self._ctf.address, "topics": [self.TRANSFER_SINGLE_TOPIC, None, None, self._proxy_topic]},
+        }
+        await self._watcher.run(ws_url, "POLYGON_WS_URL", filters, "Polymarket")
+
+    def _get_logs_chunked(self, address: str, topics: list, blocks_back: int) -> list:
+        """Logs over the last blocks_back blocks, split into LOG_CHUNK windows sent as one JSON-RPC batch."""
         current = self.w3.eth.block_number
         from_block = max(0, current - blocks_back)
-        sig = "0x" + self.w3.keccak(text="TransferSingle(address,address,address,uint256,uint256)").hex()
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
+        filters = [
+            {"fromBlock": start, "toBlock": min(start + self.LOG_CHUNK - 1, current), "address": address, "topics": topics}
+            for start in range(from_block, current + 1, self.LOG_CHUNK)
+        ]
+        if len(filters) == 1:
+            return self.w3.eth.get_logs(filters[0])
+        try:
+            with self.w3.batch_requests() as batch:
+                for f in filters:
+                    batch.add(self.w3.eth.get_logs(f))
+                chunks = batch.execute()
+        except (MethodUnavailable, AttributeError) as e:
+            logger.warning(f"JSON-RPC batch unavailable, fetching log chunks one by one: {e}")
+            chunks = [self.w3.eth.get_logs(f) for f in filters]
+        return [log for chunk in chunks for log in chunk]
 
-        logs = self.w3.eth.get_logs({
-            "fromBlock": from_block, "toBlock": "latest",
-            "address": Web3.to_checksum_address(self.CTF_ADDRESS),
-            "topics": [sig, None, None, "0x" + proxy[2:].lower().zfill(64)],
-        })
+    def find_incoming_erc1155(self, token_id: str, expected_amount: int, blocks_back: int = 50) -> dict:
+        if not self.w3:
+            raise RuntimeError("Web3 not initialized")
+        pushed = self._watcher.pushed(int(token_id), expected_amount * 0.95, blocks_back)
+        if pushed is not None:
+            return pushed
+        logs = self._get_logs_chunked(
+            self._ctf.address, [self.TRANSFER_SINGLE_TOPIC, None, None, self._proxy_topic], blocks_back,
+        )
+        tid = int(token_id)
         for log in reversed(logs):
-            data = log["data"].hex() if isinstance(log["data"], bytes) else log["data"]
-            if data.startswith("0x"):
-                data = data[2:]
-            log_tid = int(data[0:64], 16)
-            log_val = int(data[64:128], 16)
-            if str(log_tid) == token_id and log_val >= expected_amount * 0.95:
-                tx_hash = log["transactionHash"].hex() if isinstance(log["transactionHash"], bytes) else log["transactionHash"]
-                if not tx_hash.startswith("0x"):
-                    tx_hash = "0x" + tx_hash
+            data = as_bytes(log["data"])
+            log_tid = int.from_bytes(data[0:32], "big")
+            log_val = int.from_bytes(data[32:64], "big")
+            if log_tid == tid and log_val >= expected_amount * 0.95:
+                tx_hash = _as_0x(log["transactionHash"])
                 return {"found": True, "tx_hash": tx_hash, "amount": log_val, "block": log["blockNumber"]}
         return {"found": False, "tx_hash": None, "amount": 0, "block": 0}
 
     def find_incoming_erc20(self, expected_amount: int, blocks_back: int = 50) -> dict:
         if not self.w3:
             raise RuntimeError("Web3 not initialized")
-        current = self.w3.eth.block_number
-        from_block = max(0, current - blocks_back)
-        sig = "0x" + self.w3.keccak(text="Transfer(address,address,uint256)").hex()
-        proxy = Web3.to_checksum_address(self.proxy_wallet)
-
-        logs = self.w3.eth.get_logs({
-            "fromBlock": from_block, "toBlock": "latest",
-            "address": Web3.to_checksum_address(self.USDC_ADDRESS),
-            "topics": [sig, None, "0x" + proxy[2:].lower().zfill(64)],
-        })
+        pushed = self._watcher.pushed(None, expected_amount * 0.95, blocks_back)
+        if pushed is not None:
+            return pushed
+        logs = self._get_logs_chunked(self._usdc.address, [self.TRANSFER_TOPIC, None, self._proxy_topic], blocks_back)
         for log in reversed(logs):
-            data = log["data"].hex() if isinstance(log["data"], bytes) else log["data"]
-            if data.startswith("0x"):
-                data = data[2:]
-            log_val = int(data, 16)
+            log_val = int.from_bytes(as_bytes(log["data"])[0:32], "big")
             if log_val >= expected_amount * 0.95:
-                tx_hash = log["transactionHash"].hex() if isinstance(log["transactionHash"], bytes) else log["transactionHash"]
-                if not tx_hash.startswith("0x"):
-                    tx_hash = "0x" + tx_hash
+                tx_hash = _as_0x(log["transactionHash"])
                 return {"found": True, "tx_hash": tx_hash, "amount": log_val, "block": log["blockNumber"]}
         return {"found": False, "tx_hash": None, "amount": 0, "block": 0}
 
+    # --- Batched Reads ---
+
+    def _batch_call(self, fns: list) -> list:
+        """Run contract read calls as JSON-RPC batches of BATCH_SIZE; per-call fallback if the node refuses batches."""
+        results = []
+        try:
+            for i in range(0, len(fns), self.BATCH_SIZE):
+                with self.w3.batch_requests() as batch:
+                    for fn in fns[i:i + self.BATCH_SIZE]:
+                        batch.add(fn)
+                    results.extend(batch.execute())
+            return results
+        except (MethodUnavailable, AttributeError) as e:
+            logger.warning(f"JSON-RPC batch unavailable, falling back to single calls: {e}")
+            return [fn.call() for fn in fns]
+
     # --- User Approval Check ---
 
     def check_user_approval(self, user_address: str) -> Dict[str, bool]:
         main_eoa = self.relayer_address
         results = {}
         try:
-            results["ctf"] = self.check_erc1155_approval(user_address, main_eoa)
-        except Exception as e:
-            logger.error(f"CTF approval check failed: {e}")
-            results["ctf"] = False
-        try:
-            allowance = self.check_erc20_approval(user_address, main_eoa)
+            if not self.w3:
+                raise RuntimeError("Web3 not initialized")
+            user = _checksum(user_address)
+            approved, allowance = self._batch_call([
+                self._ctf.functions.isApprovedForAll(user, main_eoa),
+                self._usdc.functions.allowance(user, main_eoa),
+            ])
+            results["ctf"] = approved
             results["usdc"] = allowance > 0
             results["usdc_allowance"] = allowance
         except Exception as e:
-            logger.error(f"USDC approval check failed: {e}")
+            logger.error(f"Approval check failed: {e}")
+            results["ctf"] = False
             results["usdc"] = False
             results["usdc_allowance"] = 0
         logger.info(f"User {user_address[:10]}... approvals: CTF={results['ctf']}, USDC={results['usdc']}")
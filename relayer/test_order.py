@@ -1,8 +1,10 @@
 """Test placing a small order on Polymarket via adapter"""
-import os, sys, logging, time
+import os, sys, json, logging, asyncio
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
+from eth_abi import encode
+from adapters.base import multicall3, SEL_ALLOWANCE, SEL_IS_APPROVED_FOR_ALL
 
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 logging.basicConfig(level=logging.INFO)
@@ -16,15 +18,17 @@ from web3.middleware import ExtraDataToPOAMiddleware
 w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
 account = Account.from_key(PK)
 
-USDC_E = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
-CTF = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
-EXCHANGE_REGULAR = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
-EXCHANGE_NEGRISK = "0xC5d563A36AE78145C45a50134d48A1215220f80a"
-NEG_RISK_EXECUTOR = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
+USDC_E = Web3.to_checksum_address("0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174")
+CTF = Web3.to_checksum_address("0x4D97DCd97eC945f40cF65F87097ACe5EA0476045")
+EXCHANGE_REGULAR = Web3.to_checksum_address("0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E")
+EXCHANGE_NEGRISK = Web3.to_checksum_address("0xC5d563A36AE78145C45a50134d48A1215220f80a")
+NEG_RISK_EXECUTOR = Web3.to_checksum_address("0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296")
 
 TOKEN_ID = "4394372887385518214471608448209527405727552777602031099972143344338178308080"
 MARKET_ID = 558934
 MAX_UINT = 2**256 - 1
+CHAIN_ID = 137
+APPROVED_CACHE = os.path.join(os.path.dirname(__file__), "approved.json")
 
 print(f"User: {USER_ADDR}")
 bal = w3.eth.get_balance(USER_ADDR)
@@ -40,57 +44,107 @@ ctf_abi = [
     {"inputs": [{"name": "operator", "type": "address"}, {"name": "approved", "type": "bool"}], "name": "setApprovalForAll", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
 ]
 
-usdc = w3.eth.contract(address=Web3.to_checksum_address(USDC_E), abi=erc20_abi)
-ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF), abi=ctf_abi)
+usdc = w3.eth.contract(address=USDC_E, abi=erc20_abi)
+ctf = w3.eth.contract(address=CTF, abi=ctf_abi)
 
 usdc_bal = usdc.functions.balanceOf(USER_ADDR).call()
 print(f"USDC.e: {usdc_bal / 1e6:.4f}")
 
-def send_tx(tx_data):
-    """Send tx with proper gas and wait for receipt"""
-    gas_price = w3.eth.gas_price
-    tx_data["maxFeePerGas"] = int(gas_price * 2)
-    tx_data["maxPriorityFeePerGas"] = int(gas_price)
-    signed = account.sign_transaction(tx_data)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"  tx: 0x{tx_hash.hex()}")
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-    print(f"  status: {'OK' if receipt['status']==1 else 'FAILED'}")
-    return receipt
-
-# Step 1: USDC approvals
+def eip1559_fees():
+    """(maxFeePerGas, maxPriorityFeePerGas) from one eth_feeHistory call: p50 tip over 5 blocks, 30 gwei floor"""
+    fh = w3.eth.fee_history(5, "latest", [50])
+    base = fh["baseFeePerGas"][-1]
+    tips = sorted(r[0] for r in fh["reward"] if r)
+    tip = max(int(30e9), tips[len(tips) // 2] if tips else 0)
+    return base * 2 + tip, tip
+
+
+def build_tx(fn, nonce, max_fee, tip):
+    """Build with explicit nonce/fees so web3 makes no per-tx RPC fills"""
+    return fn.build_transaction({
+        "from": USER_ADDR, "nonce": nonce, "gas": 60000, "chainId": CHAIN_ID,
+        "maxFeePerGas": max_fee, "maxPriorityFeePerGas": tip,
+    })
+
+
+def load_approved():
+    """Wallets whose approvals were all confirmed on a previous run"""
+    try:
+        with open(APPROVED_CACHE) as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        return set()
+
+
+async def wait_receipts(tx_hashes):
+    """Wait for all receipts concurrently"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[
+        loop.run_in_executor(None, lambda h=h: w3.eth.wait_for_transaction_receipt(h, timeout=120))
+        for h in tx_hashes
+    ])
+
 contracts = [
     ("Regular Exchange", EXCHANGE_REGULAR),
     ("NegRisk Exchange", EXCHANGE_NEGRISK),
     ("NegRisk Executor", NEG_RISK_EXECUTOR),
 ]
 
-for name, addr in contracts:
-    allowance = usdc.functions.allowance(USER_ADDR, Web3.to_checksum_address(addr)).call()
-    if allowance < 10**12:
-        print(f"Approving USDC for {name}...")
-        tx = usdc.functions.approve(Web3.to_checksum_address(addr), MAX_UINT).build_transaction({
-            "from": USER_ADDR, "nonce": w3.eth.get_transaction_count(USER_ADDR, "pending"),
-            "gas": 60000, "chainId": 137,
-        })
-        send_tx(tx)
-        time.sleep(2)  # wait for nonce to propagate
-    else:
-        print(f"USDC approved for {name} (allowance: {allowance})")
-
-# Step 2: CTF approvals
-for name, addr in contracts:
-    ok = ctf.functions.isApprovedForAll(USER_ADDR, Web3.to_checksum_address(addr)).call()
-    if not ok:
-        print(f"Approving CTF for {name}...")
-        tx = ctf.functions.setApprovalForAll(Web3.to_checksum_address(addr), True).build_transaction({
-            "from": USER_ADDR, "nonce": w3.eth.get_transaction_count(USER_ADDR, "pending"),
-            "gas": 60000, "chainId": 137,
-        })
-        send_tx(tx)
-        time.sleep(2)
-    else:
-        print(f"CTF approved for {name}")
+# Approvals are permanent (MAX_UINT / operator flag), so once confirmed for a wallet skip the checks next run
+approved_users = load_approved()
+if USER_ADDR in approved_users:
+    print(f"Approvals cached in {APPROVED_CACHE}, skipping checks")
+else:
+    # Read all allowances + operator approvals in one Multicall3 eth_call
+    calls = []
+    for name, addr in contracts:
+        args = encode(["address", "address"], [USER_ADDR, addr])
+        calls.append((USDC_E, SEL_ALLOWANCE + args))
+        calls.append((CTF, SEL_IS_APPROVED_FOR_ALL + args))
+    results = multicall3(w3, calls)
+    allowances = [int.from_bytes(ret, "big") if ok else 0 for ok, ret in results[0::2]]
+    approved = [ok and int.from_bytes(ret, "big") == 1 for ok, ret in results[1::2]]
+
+    # Collect every missing approval, then sign with consecutive nonces
+    pending = []
+    for (name, addr), allowance in zip(contracts, allowances):
+        if allowance < 10**12:
+            print(f"Approving USDC for {name}...")
+            pending.append((f"USDC {name}", usdc.functions.approve(addr, MAX_UINT)))
+        else:
+            print(f"USDC approved for {name} (allowance: {allowance})")
+
+    for (name, addr), ok in zip(contracts, approved):
+        if not ok:
+            print(f"Approving CTF for {name}...")
+            pending.append((f"CTF {name}", ctf.functions.setApprovalForAll(addr, True)))
+        else:
+            print(f"CTF approved for {name}")
+
+    if pending:
+        base_nonce = w3.eth.get_transaction_count(USER_ADDR, "pending")
+        # One fee read per batch; later nonces get a small bump against congestion
+        max_fee, tip = eip1559_fees()
+        txs = [
+            build_tx(fn, base_nonce + i, int(max_fee * (1 + 0.12 * i)), int(tip * (1 + 0.12 * i)))
+            for i, (_, fn) in enumerate(pending)
+        ]
+        # Sign everything in one pass before the first broadcast
+        signed = [account.sign_transaction(tx) for tx in txs]
+        # Broadcast in nonce order without waiting, then await all receipts together
+        tx_hashes = []
+        for (label, _), stx in zip(pending, signed):
+            tx_hash = w3.eth.send_raw_transaction(stx.raw_transaction)
+            print(f"  {label} tx: 0x{tx_hash.hex()}")
+            tx_hashes.append(tx_hash)
+        receipts = asyncio.run(wait_receipts(tx_hashes))
+        for (label, _), receipt in zip(pending, receipts):
+            print(f"  {label} status: {'OK' if receipt['status']==1 else 'FAILED'}")
+
+    if not pending or all(r["status"] == 1 for r in receipts):
+        approved_users.add(USER_ADDR)
+        with open(APPROVED_CACHE, "w") as f:
+            json.dump(sorted(approved_users), f)
 
 print("\n--- All approvals done, placing order ---\n")
 
@@ -102,19 +156,30 @@ adapter = PolymarketAdapter(
     proxy_wallet=USER_ADDR,
     rpc_url=POLYGON_RPC,
 )
-adapter.authenticate()
-
-best = adapter.get_best_offer(TOKEN_ID, "BUY")
-price = best["price"]
-amount = max(1.0, 1.1 / price)
-cost = amount * price
-print(f"Best ask: {price}, buying {amount:.2f} shares = ${cost:.4f}")
-
-resp = adapter.place_order(
-    token_id=TOKEN_ID,
-    market_id=MARKET_ID,
-    amount=amount,
-    price=price,
-    side="BUY",
-)
-print(f"\nOrder response: {resp}")
+
+
+async def main():
+    try:
+        # Auth (creds derivation) and the public book fetch are independent; overlap them
+        _, best = await asyncio.gather(
+            asyncio.to_thread(adapter.authenticate),
+            adapter.aget_best_offer(TOKEN_ID, "BUY"),
+        )
+        price = best["price"]
+        amount = max(1.0, 1.1 / price)
+        cost = amount * price
+        print(f"Best ask: {price}, buying {amount:.2f} shares = ${cost:.4f}")
+
+        resp = await adapter.aplace_order(
+            token_id=TOKEN_ID,
+            market_id=MARKET_ID,
+            amount=amount,
+            price=price,
+            side="BUY",
+        )
+        print(f"\nOrder response: {resp}")
+    finally:
+        await PolymarketAdapter.aclose_clob()
+
+
+asyncio.run(main())